@@ -10,18 +10,37 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-# from collections import OrderedDict
-# import threading
+from collections import OrderedDict
+from concurrent import futures
+import contextlib
+import copy
+import functools
+import hashlib
+import inspect
+import pickle
+import threading
+import time
+import uuid
+import zlib
 
 from iotronicclient import client as iotronic_client
-# from django.conf import settings
+from iotronicclient import exc as iotronic_exc
+from iotronicclient.v1 import board as iotronic_board
+from django.conf import settings
+from keystoneauth1 import exceptions as ks_exc
+from keystoneauth1 import session as ks_session
+from keystoneauth1 import token_endpoint
+from django.core.cache import caches
+from django.utils.module_loading import import_string
 from django.utils.translation import ugettext_lazy as _
 
 # from horizon import exceptions
 from horizon.utils.memoized import memoized  # noqa
 
 from openstack_dashboard.api import base
-# from openstack_dashboard.api import keystone
+from openstack_dashboard.api import keystone
+
+from iotronic_ui.iot import inventory as inventory_db
 
 
 # TESTING
@@ -31,26 +50,1840 @@ LOG = logging.getLogger(__name__)
 
 @memoized
 def iotronicclient(request):
-    """Initialization of Iotronic client."""
+    """Initialization of Iotronic client.
+
+    The client sends the token of the request through the connections
+    pooled by the process for its endpoint, guarded by the circuit breaker
+    of the endpoint and bounded by the deadline of the request.
+    """
+
+    endpoint = _endpoint(request)
+    auth = token_endpoint.Token(endpoint, request.user.token.id)
+
+    client = iotronic_client.Client('1', endpoint,
+                                    session=_session(endpoint), auth=auth)
+
+    breaker = _breaker(endpoint) if _breaker_config()['failures'] else None
+    http_client = client.http_client
+    for name in ('json_request', 'raw_request'):
+        send = getattr(http_client, name)
+        if breaker is not None:
+            send = functools.partial(breaker.call, send)
+        setattr(http_client, name, _within_deadline(_deadline(request), send))
+
+    return client
+
+
+# HTTP SESSIONS
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+_ENDPOINTS = {}
+
+
+def _session(endpoint):
+    """Process-wide keystoneauth session of an IoTronic endpoint.
+
+    Its connections are kept alive, up to IOTRONIC_UI_HTTP_POOL_SIZE, and
+    reused by the clients of every request. Its calls give up after
+    IOTRONIC_UI_HTTP_TIMEOUT seconds, unless the deadline of the request
+    is nearer.
+    """
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(endpoint)
+        if session is None:
+            insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
+            cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
+            session = ks_session.Session(
+                verify=False if insecure else cacert or True,
+                timeout=getattr(settings, 'IOTRONIC_UI_HTTP_TIMEOUT', 60))
+
+            pool_size = getattr(settings, 'IOTRONIC_UI_HTTP_POOL_SIZE', 10)
+            for scheme in ('https://', 'http://'):
+                session.session.mount(scheme, ks_session.TCPKeepAliveAdapter(
+                    pool_connections=1, pool_maxsize=pool_size))
+
+            _SESSIONS[endpoint] = session
+
+        return session
+
+
+def _endpoint(request):
+    """IoTronic endpoint of the request, resolved once per project and
+    region for IOTRONIC_UI_ENDPOINT_TTL seconds.
+    """
+    key = (request.user.project_id,
+           getattr(request.user, 'services_region', None))
+    now = time.time()
+
+    with _SESSIONS_LOCK:
+        endpoint, expires = _ENDPOINTS.get(key, (None, 0))
+
+    if expires <= now:
+        endpoint = base.url_for(request, 'iot')
+        ttl = getattr(settings, 'IOTRONIC_UI_ENDPOINT_TTL', 300)
+        with _SESSIONS_LOCK:
+            _ENDPOINTS[key] = (endpoint, now + ttl)
+
+    return endpoint
+
+
+# CIRCUIT BREAKERS
+_BREAKER_DEFAULTS = {'failures': 5,
+                     'slow_call': 10,
+                     'reset_timeout': 30,
+                     'stale_ttl': 3600,
+                     'stale_entries': 20000}
+
+# Errors telling that the endpoint, rather than the request, is failing
+_ENDPOINT_FAILURES = (ks_exc.ConnectionError, iotronic_exc.ConnectionError,
+                      iotronic_exc.HttpServerError)
+
+_BREAKERS = {}
+
+
+class CircuitOpen(iotronic_exc.ServiceUnavailable):
+    """IoTronic was not called, its endpoint is failing."""
+
+
+def _breaker_config():
+    return dict(_BREAKER_DEFAULTS,
+                **getattr(settings, 'IOTRONIC_UI_CIRCUIT_BREAKER', {}))
+
+
+def _slow_call(read):
+    """Seconds after which a call of a half-open breaker has failed."""
+    slow_call = _breaker_config()['slow_call']
+    if read:
+        return slow_call
+
+    return max(slow_call, getattr(settings, 'IOTRONIC_UI_HTTP_TIMEOUT', 60))
+
+
+class _Breaker(object):
+    """Circuit breaker of an IoTronic endpoint.
+
+    Closed, it lets every call through and counts the consecutive calls
+    that failed, or read and took more than
+    IOTRONIC_UI_CIRCUIT_BREAKER['slow_call'] seconds: the board actions,
+    e.g. plugin calls, may take long on a healthy endpoint. After
+    ['failures'] of them it opens and fails the calls at once with
+    CircuitOpen. ['reset_timeout'] seconds later, half-open, it lets a
+    single probe call through: its success closes the breaker, its failure
+    opens it again. A probe still running after ['slow_call'] seconds, or
+    IOTRONIC_UI_HTTP_TIMEOUT for an action, has failed.
+    """
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probe = None
+        self._probe_started = None
+        self._probe_limit = None
+
+    def _is_open(self, now, config):
+        if self._probe is not None:
+            if now - self._probe_started < self._probe_limit:
+                return True
+
+            # The probe hangs: open the breaker again, a call finishing
+            # after this tells nothing of the endpoint.
+            self._probe = None
+            self._opened_at = now
+
+        return now - self._opened_at < config['reset_timeout']
+
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if self._is_open(time.time(), _breaker_config()):
+                return 'open'
+            return 'half-open'
+
+    def _before_call(self, read=True):
+        """The probe of a half-open breaker, or None."""
+        with self._lock:
+            if self._opened_at is None:
+                return None
+
+            now = time.time()
+            if self._is_open(now, _breaker_config()):
+                raise CircuitOpen('IoTronic is not responding at %s' %
+                                  self.endpoint)
+
+            self._probe = object()
+            self._probe_started = now
+            self._probe_limit = _slow_call(read)
+            return self._probe
+
+    def _after_call(self, probe, failed, elapsed, read=True):
+        config = _breaker_config()
+        failed = failed or (read and elapsed >= config['slow_call'])
+
+        with self._lock:
+            if probe is not None:
+                if probe is not self._probe:
+                    # Expired, already counted as failed
+                    return
+                self._probe = None
+
+            if not failed:
+                if self._opened_at is not None:
+                    LOG.info('IoTronic is responding again at %s',
+                             self.endpoint)
+                self._failures = 0
+                self._opened_at = None
+                return
+
+            self._failures += 1
+            if probe is not None or (self._opened_at is None and
+                                     self._failures >= config['failures']):
+                if probe is None:
+                    LOG.warning('IoTronic is not responding at %s, failing '
+                                'its calls for %s seconds', self.endpoint,
+                                config['reset_timeout'])
+                self._opened_at = time.time()
+
+    def call(self, func, *args, **kwargs):
+        # Called with the HTTP method first
+        read = args[:1] == ('GET',)
+        probe = self._before_call(read)
+        started = time.time()
+        failed = True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        except ks_exc.ConnectTimeout:
+            # Maybe cut short by the deadline of a request: it counts as a
+            # failure only if it ran for slow_call seconds
+            failed = False
+            raise
+        except _ENDPOINT_FAILURES:
+            raise
+        except Exception:
+            # The endpoint answered, e.g. NotFound
+            failed = False
+            raise
+        finally:
+            self._after_call(probe, failed, time.time() - started, read)
+
+
+def _breaker(endpoint):
+    with _SESSIONS_LOCK:
+        if endpoint not in _BREAKERS:
+            _BREAKERS[endpoint] = _Breaker(endpoint)
+
+        return _BREAKERS[endpoint]
+
+
+def breaker_states():
+    """Map the IoTronic endpoints to the state of their breaker: closed,
+    open or half-open.
+    """
+    with _SESSIONS_LOCK:
+        breakers = list(_BREAKERS.values())
+
+    return dict((breaker.endpoint, breaker.state()) for breaker in breakers)
+
+
+@memoized
+def _degraded(request):
+    # NOTE: memoized keeps this only while the request is alive
+    return set()
+
+
+def degraded(request):
+    """The entities shown to the request from their last known data, as
+    IoTronic was not responding.
+    """
+    return _degraded(request)
+
+
+def _stale_get(request, entity, key):
+    """The last known data of a cached call, while IoTronic is failing."""
+    if not _breaker_config()['stale_ttl']:
+        return None
+
+    frozen = _stale_cache(entity).get(key)
+    if frozen is not None:
+        _degraded(request).add(entity)
+
+    return frozen
+
+
+def _stale_set(entity, key, frozen):
+    ttl = _breaker_config()['stale_ttl']
+    if ttl:
+        _stale_cache(entity).set(key, frozen, ttl)
+
+
+def _stale_cache(entity):
+    # Not dropped by the changes of the entity: still the last known data
+    return _cache('stale:' + entity, _breaker_config()['stale_entries'])
+
+
+# DEADLINES
+class DeadlineExceeded(iotronic_exc.GatewayTimeout):
+    """IoTronic did not answer before the deadline of the request."""
+
+
+class _Deadline(object):
+    def __init__(self):
+        self.at = None
+
+    def remaining(self):
+        return None if self.at is None else self.at - time.time()
+
+
+@memoized
+def _deadline(request):
+    # NOTE: memoized keeps this only while the request is alive, so the
+    # client must only hold this and not the request.
+    return _Deadline()
+
+
+def set_deadline(request, seconds):
+    """Give the IoTronic calls of the request seconds from now.
+
+    Every later HTTP call of the request is sent with the remaining time as
+    its timeout, and fails with DeadlineExceeded once it is over. Returns
+    the deadline, a time.time() value.
+    """
+    _deadline(request).at = time.time() + seconds
+    return _deadline(request).at
+
+
+class _Detached(object):
+    """Stand-in for a request, with its user, for the work outliving it.
+
+    Its deadline, which is not set, the entities it shows from their last
+    known data and its memoized data are its own.
+    """
+
+    def __init__(self, request):
+        self.user = request.user
+
+
+def _within_deadline(deadline, send):
+    def call(method, url, **kwargs):
+        remaining = deadline.remaining()
+        if remaining is None:
+            return send(method, url, **kwargs)
+
+        if remaining <= 0:
+            raise DeadlineExceeded('No time left to call IoTronic')
+
+        kwargs['timeout'] = remaining
+        try:
+            return send(method, url, **kwargs)
+        except ks_exc.ConnectTimeout:
+            raise DeadlineExceeded('IoTronic did not answer in time')
+
+    return call
+
+
+# CONCURRENT CALLS
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+# Tells the threads of the pool running a call
+_WORKER = threading.local()
+
+
+def _executor():
+    """Process-wide bounded pool used to run backend calls concurrently."""
+    global _EXECUTOR
+
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            workers = getattr(settings, 'IOTRONIC_UI_MAX_WORKERS', 8)
+            _EXECUTOR = futures.ThreadPoolExecutor(max_workers=workers)
+
+    return _EXECUTOR
+
+
+def _call_inline(request, calls, deadline):
+    """Run the calls one after the other, as call_concurrently does."""
+    results = [None] * len(calls)
+    errors = {}
+    for i, (func, args) in enumerate(calls):
+        if deadline is not None and time.time() >= deadline:
+            errors[i] = futures.TimeoutError()
+            continue
+
+        try:
+            results[i] = func(request, *args)
+        except Exception as e:
+            errors[i] = e
+
+    return results, errors
+
+
+def _call_on_pool(request, calls, timeout, deadline):
+    started = [None] * len(calls)
+
+    def call(index, func, args):
+        started[index] = time.time()
+        _WORKER.running = True
+        try:
+            return func(request, *args)
+        finally:
+            _WORKER.running = False
+
+    pending = [_executor().submit(call, i, func, args)
+               for i, (func, args) in enumerate(calls)]
+
+    def expired(index):
+        now = time.time()
+        # The timeout of a call starts when a worker picks it up, not
+        # while it is still queued behind the others.
+        return ((started[index] is not None and
+                 now >= started[index] + timeout) or
+                (deadline is not None and now >= deadline))
+
+    results = [None] * len(calls)
+    errors = {}
+    for i, future in enumerate(pending):
+        while True:
+            if timeout is None:
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    errors[i] = e
+                break
+
+            limit = (started[i] or time.time()) + timeout
+            if deadline is not None:
+                limit = min(limit, deadline)
+
+            try:
+                results[i] = future.result(
+                    timeout=max(0, limit - time.time()))
+            except futures.TimeoutError as e:
+                if not expired(i):
+                    continue
+                future.cancel()
+                errors[i] = e
+            except Exception as e:
+                errors[i] = e
+            break
+
+    return results, errors
+
+
+def call_concurrently(request, calls, timeout=None, deadline=None,
+                      wait_all=False):
+    """Run every (func, args) pair of calls as func(request, *args).
+
+    Returns a (results, errors) pair: results follows the order of calls
+    and holds None for every failed call, errors maps the index of a failed
+    call to the exception it raised (futures.TimeoutError when the call ran
+    for more than timeout seconds or was still running at deadline, a
+    time.time() value, by default the deadline of the request).
+
+    With wait_all, e.g. for the calls changing IoTronic whose outcome must
+    be reported, every call is waited for however long it runs, up to
+    IOTRONIC_UI_HTTP_TIMEOUT.
+
+    Called from a call already running on the pool, the calls are run one
+    after the other in its thread: a worker waiting for other workers could
+    starve the pool. With IOTRONIC_UI_ASYNC, calls that all have a
+    coroutine variant in iotronic_async are run on an event loop in this
+    thread instead of on the pool.
+    """
+    if wait_all:
+        timeout = deadline = None
+    else:
+        if timeout is None:
+            timeout = getattr(settings, 'IOTRONIC_UI_CALL_TIMEOUT', 30)
+        if deadline is None:
+            deadline = _deadline(request).at
+
+    # The client carries the token of this request only: build it here so
+    # that the workers share it instead of racing to create it.
+    iotronicclient(request)
+
+    layer = _async_layer()
+    if getattr(_WORKER, 'running', False):
+        results, errors = _call_inline(request, calls, deadline)
+    elif layer is not None and layer.covers(calls):
+        results, errors = layer.gather(request, calls, timeout, deadline)
+    else:
+        results, errors = _call_on_pool(request, calls, timeout, deadline)
+
+    for i, error in errors.items():
+        func, args = calls[i]
+        LOG.warning('Concurrent call %s%s failed: %r',
+                    getattr(func, '__name__', func), args, error)
+
+    return results, errors
+
+
+def _async_layer():
+    """The iotronic_async module with IOTRONIC_UI_ASYNC, or None."""
+    if not getattr(settings, 'IOTRONIC_UI_ASYNC', False):
+        return None
+
+    try:
+        from openstack_dashboard.api import iotronic_async
+    except (ImportError, SyntaxError):
+        # Python 2 can not even parse it
+        return None
+
+    return iotronic_async if iotronic_async.available() else None
+
+
+def fan_out(request, func, args_list, timeout=None, deadline=None):
+    """Call func(request, *args) concurrently for every tuple in args_list.
+
+    Results and errors are returned as by call_concurrently.
+    """
+    return call_concurrently(request, [(func, args) for args in args_list],
+                             timeout=timeout, deadline=deadline)
+
+
+# CACHES
+_CACHE_TTL = {'board': 0,
+              'board_detail': 60,
+              'fleet': 60,
+              'not_found': 30,
+              'owner': 300,
+              'plugin': 60,
+              'port': 30,
+              'service': 60,
+              'webservice': 30}
+
+_CACHES = {}
+_CACHES_LOCK = threading.Lock()
+_CACHE_STATS = {}
+_CACHE_GENERATIONS = {}
+_FLIGHTS = {}
+
+
+class _LocalCache(object):
+    """In-process LRU cache whose entries expire after their TTL.
+
+    This is the default IOTRONIC_UI_CACHE_BACKEND. A backend is built with
+    the entity it caches and the maximum number of entries it may hold; get
+    returns None on a miss and invalidate drops every entry. Keys are tuples
+    whose first item is the project the entry belongs to, or None. A shared
+    backend may also provide generation(), changing on every invalidate.
+    """
+
+    def __init__(self, entity, max_entries):
+        self.entity = entity
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None or entry[1] < time.time():
+                return None
+
+            # The most recently used entries are kept at the end
+            self._data[key] = entry
+            return entry[0]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (value, time.time() + ttl)
+
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._data),
+                    'evictions': self._evictions}
+
+
+class DjangoCache(object):
+    """Cache backed by the Django cache IOTRONIC_UI_CACHE_ALIAS.
+
+    Setting IOTRONIC_UI_CACHE_BACKEND to this class shares the cached data
+    between every Horizon process using the same memcached or redis server.
+    Values are pickled and compressed, keys are namespaced by entity and
+    project, and invalidate bumps the generation of the entity rather than
+    deleting its keys.
+    """
+
+    def __init__(self, entity, max_entries):
+        self.entity = entity
+        self._cache = caches[getattr(settings, 'IOTRONIC_UI_CACHE_ALIAS',
+                                     'default')]
+        self._generation_key = 'iotronic_ui:%s:generation' % entity
+
+    def generation(self):
+        generation = self._cache.get(self._generation_key)
+        if generation is None:
+            self._cache.add(self._generation_key, 1, None)
+            generation = self._cache.get(self._generation_key, 1)
+
+        return generation
+
+    def _key(self, key):
+        digest = hashlib.sha1(repr(key[1:]).encode('utf-8')).hexdigest()
+        return 'iotronic_ui:%s:%s:%s:%s' % (self.entity, self.generation(),
+                                            key[0], digest)
+
+    def get(self, key):
+        value = self._cache.get(self._key(key))
+        if value is None:
+            return None
+
+        return pickle.loads(zlib.decompress(value))
+
+    def set(self, key, value, ttl):
+        value = zlib.compress(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        self._cache.set(self._key(key), value, ttl)
+
+    def invalidate(self):
+        try:
+            self._cache.incr(self._generation_key)
+        except ValueError:
+            # The generation expired or was evicted, start a new one
+            self._cache.set(self._generation_key, int(time.time()), None)
+
+    @contextlib.contextmanager
+    def lock(self, key):
+        """Let a single Horizon process at a time load key.
+
+        The lock is given up after IOTRONIC_UI_CALL_TIMEOUT seconds, so a
+        process dying while loading can not block the others.
+        """
+        timeout = getattr(settings, 'IOTRONIC_UI_CALL_TIMEOUT', 30)
+        lock_key = self._key(key) + ':lock'
+        deadline = time.time() + timeout
+
+        locked = self._cache.add(lock_key, 1, timeout)
+        while not locked and time.time() < deadline:
+            if self._cache.get(self._key(key)) is not None:
+                break
+            time.sleep(0.05)
+            locked = self._cache.add(lock_key, 1, timeout)
+
+        try:
+            yield
+        finally:
+            if locked:
+                self._cache.delete(lock_key)
+
+
+@contextlib.contextmanager
+def _no_lock(key):
+    yield
+
+
+def _cache(entity, max_entries=None):
+    with _CACHES_LOCK:
+        if entity not in _CACHES:
+            backend = getattr(settings, 'IOTRONIC_UI_CACHE_BACKEND', None)
+            backend = import_string(backend) if backend else _LocalCache
+            if max_entries is None:
+                max_entries = getattr(settings,
+                                      'IOTRONIC_UI_CACHE_MAX_ENTRIES', 1000)
+            _CACHES[entity] = backend(entity, max_entries)
+            _CACHE_STATS[entity] = {'hits': 0, 'misses': 0, 'coalesced': 0}
+
+        return _CACHES[entity]
+
+
+def _cache_ttl(entity):
+    if _EVENTS_CONNECTED.is_set():
+        events_ttl = getattr(settings, 'IOTRONIC_UI_EVENTS', {}).get(
+            'cache_ttl', {})
+        if entity in events_ttl:
+            return events_ttl[entity]
+
+    return getattr(settings, 'IOTRONIC_UI_CACHE_TTL', {}).get(
+        entity, _CACHE_TTL.get(entity, 0))
+
+
+def _cache_count(entity, counter):
+    with _CACHES_LOCK:
+        _CACHE_STATS[entity][counter] += 1
+
+
+def _cache_get(entity, key):
+    if not _cache_ttl(entity):
+        return None
+
+    value = _cache(entity).get(key)
+    _cache_count(entity, 'misses' if value is None else 'hits')
+    return value
+
+
+def _cache_set(entity, key, value):
+    ttl = _cache_ttl(entity)
+    if ttl:
+        _cache(entity).set(key, value, ttl)
+
+
+class _Flight(object):
+    """A backend call shared by every concurrent caller asking for it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def _single_flight(entity, flight_key, loader, deadline=None):
+    """Call loader() once for all the concurrent callers with flight_key.
+
+    The first caller runs loader(); the others wait for it and get its
+    result, or its exception, and are counted as coalesced. They wait only
+    until their own deadline, if any, and call again themselves when the
+    deadline of the first caller is over.
+    """
+    _cache(entity)
+    while True:
+        with _CACHES_LOCK:
+            flight = _FLIGHTS.get((entity, flight_key))
+            leader = flight is None
+            if leader:
+                flight = _FLIGHTS[(entity, flight_key)] = _Flight()
+            else:
+                _CACHE_STATS[entity]['coalesced'] += 1
+
+        if leader:
+            break
+
+        remaining = None if deadline is None else deadline.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded('No time left to call IoTronic')
+
+        if not flight.done.wait(remaining):
+            raise DeadlineExceeded('IoTronic did not answer in time')
+
+        if isinstance(flight.error, DeadlineExceeded):
+            continue
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    try:
+        flight.value = loader()
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _CACHES_LOCK:
+            if _FLIGHTS.get((entity, flight_key)) is flight:
+                del _FLIGHTS[(entity, flight_key)]
+        flight.done.set()
+
+    return flight.value
+
+
+def _cache_get_or_load(entity, key, flight_key, loader, deadline=None):
+    """Get key from the entity cache, calling loader() on a miss.
+
+    Concurrent callers with the same flight_key share a single loader(),
+    cached or not, and wait for the other Horizon processes when the
+    backend provides a lock. See _single_flight() for the deadline.
+    """
+    if not _cache_ttl(entity):
+        return _single_flight(entity, flight_key, loader, deadline)
+
+    value = _cache_get(entity, key)
+    if value is not None:
+        return value
+
+    def load():
+        cache = _cache(entity)
+        with getattr(cache, 'lock', _no_lock)(key):
+            value = cache.get(key)
+            if value is None:
+                generation = _cache_generation(entity)
+                value = loader()
+                # Not cached if invalidated meanwhile: it may be outdated
+                if _cache_generation(entity) == generation:
+                    _cache_set(entity, key, value)
+
+        return value
+
+    return _single_flight(entity, flight_key, load, deadline)
+
+
+def _cache_generation(entity):
+    """Changes whenever the cached data of entity is dropped, by this
+    process or, with a shared backend, by any.
+    """
+    cache = _cache(entity)
+    with _CACHES_LOCK:
+        local = _CACHE_GENERATIONS.get(entity, 0)
+
+    return local, getattr(cache, 'generation', lambda: None)()
+
+
+def _invalidate_cache(entity):
+    _cache(entity).invalidate()
+    with _CACHES_LOCK:
+        _CACHE_GENERATIONS[entity] = _CACHE_GENERATIONS.get(entity, 0) + 1
+
+    # Calls already in flight may return outdated data: let the next
+    # callers start new ones
+    with _CACHES_LOCK:
+        for flight_key in list(_FLIGHTS):
+            if flight_key[0] == entity:
+                del _FLIGHTS[flight_key]
+
+
+def _invalidate(*entities):
+    """Drop the cached data of the given entities."""
+    for entity in entities:
+        _invalidate_cache(entity)
+
+    if set(entities) & set(_INVENTORY_ENTITIES):
+        _outdate_inventories()
+
+    if set(entities) & set(_BOARD_DETAIL_ENTITIES):
+        _forget_board()
+
+    for entity in set(entities) & set(_MIRRORED_ENTITIES):
+        _expire_mirror(entity)
+
+
+def cache_stats():
+    """Hit, miss and coalesced calls counters, and backend statistics, of
+    every cache.
+    """
+    stats = {}
+    for entity, cache in list(_CACHES.items()):
+        with _CACHES_LOCK:
+            stats[entity] = dict(_CACHE_STATS[entity])
+        if hasattr(cache, 'stats'):
+            stats[entity].update(cache.stats())
+
+    stats['board_detail'] = {'size': _BOARD_DETAILS.size()}
+    return stats
+
+
+def _role_scope(request):
+    """Key part shared by the users with the same project and roles."""
+    roles = sorted(role['name'] for role in getattr(request.user, 'roles', []))
+    return (request.user.project_id, tuple(roles))
+
+
+def _user_scope(request):
+    """Key part private to a project and a user."""
+    return (request.user.project_id, request.user.id)
+
+
+def _cache_scope(request, private=False):
+    """Key part that keeps cached data private to a project and a token.
+
+    With IOTRONIC_UI_CACHE_SCOPE set to 'roles' the data is shared by the
+    users with the same project and roles instead, unless private.
+    """
+    if (not private and
+            getattr(settings, 'IOTRONIC_UI_CACHE_SCOPE', 'token') == 'roles'):
+        return _role_scope(request)
+
+    token = hashlib.sha1(request.user.token.id.encode('utf-8')).hexdigest()
+    return (request.user.project_id, token)
+
+
+def _key_part(value):
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _key_part(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_key_part(v) for v in value)
+    return value
+
+
+def _call(func, args, kwargs):
+    return (func.__name__, _key_part(list(args)), _key_part(kwargs))
+
+
+def _freeze(value):
+    """Detach Iotronic resources from their client so they can be shared."""
+    if isinstance(value, list):
+        return ('list', [_freeze(item) for item in value])
+    if hasattr(value, '_info'):
+        return ('resource', value.__class__, copy.deepcopy(value._info))
+    return ('value', copy.deepcopy(value))
+
+
+def _thaw(frozen):
+    """Build a private copy of a value stored by _freeze."""
+    if frozen[0] == 'list':
+        return [_thaw(item) for item in frozen[1]]
+    if frozen[0] == 'resource':
+        return frozen[1](None, copy.deepcopy(frozen[2]), loaded=True)
+    return copy.deepcopy(frozen[1])
+
+
+def _whole_resource(call):
+    # The whole resources fill the update forms: a copy cached by another
+    # process, not dropped by the changes made from this one, would
+    # overwrite them when saved
+    return call['fields'] is None
+
+
+def _cached(entity, owner_filtered=None, uncached=None):
+    """Read-through cache the result of an Iotronic list or get call.
+
+    Results are kept for IOTRONIC_UI_CACHE_TTL[entity] seconds, per project
+    and token, and every caller gets its own copy of them. Identical calls
+    made concurrently by users with the same project and roles share a
+    single backend call, unless owner_filtered(call), given the arguments
+    of the call by name, tells that IoTronic filters its result by the
+    calling user: then only the calls of the same user are shared, and the
+    results stay private to the token whatever IOTRONIC_UI_CACHE_SCOPE. While
+    the breaker of the endpoint is open, or once the deadline of the
+    request is over, the last known results of the same shared calls are
+    returned, for up to IOTRONIC_UI_CIRCUIT_BREAKER['stale_ttl'] seconds.
+    The calls matched by uncached(call) always get fresh results, and their
+    last known ones only as such.
+    """
+    def decorator(func):
+        def private(request, args, kwargs):
+            return owner_filtered is not None and owner_filtered(
+                inspect.getcallargs(func, request, *args, **kwargs))
+
+        def stale_key(request, args, kwargs):
+            scope = (_user_scope(request) if private(request, args, kwargs)
+                     else _role_scope(request))
+            return scope + _call(func, args, kwargs)
+
+        def cache_key(request, args, kwargs):
+            if uncached is not None and uncached(
+                    inspect.getcallargs(func, request, *args, **kwargs)):
+                return None
+
+            return (_cache_scope(request, private(request, args, kwargs)) +
+                    _call(func, args, kwargs))
+
+        @functools.wraps(func)
+        def wrapper(request, *args, **kwargs):
+            key = cache_key(request, args, kwargs)
+            # Shared by the concurrent calls and as last known result
+            shared_key = stale_key(request, args, kwargs)
+
+            def load():
+                frozen = _freeze(func(request, *args, **kwargs))
+                _stale_set(entity, shared_key, frozen)
+                return frozen
+
+            try:
+                if key is None:
+                    frozen = load()
+                else:
+                    frozen = _cache_get_or_load(entity, key, shared_key,
+                                                load, _deadline(request))
+            except (CircuitOpen, DeadlineExceeded):
+                frozen = _stale_get(request, entity, shared_key)
+                if frozen is None:
+                    raise
+
+            return _thaw(frozen)
+
+        wrapper.stale_entity = entity
+        wrapper.stale_key = stale_key
+        # The key of the call in the entity cache, None if not cached
+        wrapper.cache_key = cache_key
+        return wrapper
+
+    return decorator
+
+
+def _last_known(entity):
+    """Keep the last result of an Iotronic call that is not cached.
+
+    As for the _cached calls, it is kept per project and roles and returned
+    instead while the breaker of the endpoint is open or once the deadline
+    of the request is over.
+    """
+    def decorator(func):
+        def stale_key(request, args, kwargs):
+            return _role_scope(request) + _call(func, args, kwargs)
+
+        @functools.wraps(func)
+        def wrapper(request, *args, **kwargs):
+            key = stale_key(request, args, kwargs)
+            try:
+                result = func(request, *args, **kwargs)
+            except (CircuitOpen, DeadlineExceeded):
+                frozen = _stale_get(request, entity, key)
+                if frozen is None:
+                    raise
+                return _thaw(frozen)
+
+            _stale_set(entity, key, _freeze(result))
+            return result
+
+        wrapper.stale_entity = entity
+        wrapper.stale_key = stale_key
+        return wrapper
+
+    return decorator
+
+
+def last_known(request, func, *args, **kwargs):
+    """The last known result of func(request, *args, **kwargs), a _cached
+    or _last_known call, or None.
+    """
+    frozen = _stale_get(request, func.stale_entity,
+                        func.stale_key(request, args, kwargs))
+    return None if frozen is None else _thaw(frozen)
+
+
+# NOT FOUND
+def _remember_not_found(entity):
+    """Remember the entity ids that Iotronic could not find.
+
+    Getting them again raises NotFound without calling Iotronic, for
+    IOTRONIC_UI_CACHE_TTL['not_found'] seconds or until an entity of the
+    same kind is created.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(request, entity_id, *args, **kwargs):
+            ttl = _cache_ttl('not_found')
+            if not ttl:
+                return func(request, entity_id, *args, **kwargs)
+
+            cache = _cache('not_found:' + entity)
+            key = (request.user.project_id, entity_id)
+            message = cache.get(key)
+            if message is not None:
+                _cache_count('not_found:' + entity, 'hits')
+                raise iotronic_exc.NotFound(message)
+
+            try:
+                return func(request, entity_id, *args, **kwargs)
+            except iotronic_exc.NotFound as e:
+                cache.set(key, e.message or '', ttl)
+                raise
+
+        return wrapper
+
+    return decorator
+
+
+# OWNERS
+def owner_names(request, owner_ids):
+    """Map the given Keystone user ids (board, plugin or fleet owners) to
+    their names.
+
+    Only the ids missing from the cache are looked up, concurrently; names
+    are kept for IOTRONIC_UI_CACHE_TTL['owner'] seconds. Ids that can not be
+    resolved are left out of the map.
+    """
+    names = {}
+    missing = []
+    for owner_id in set(owner_ids):
+        name = _cache_get('owner', (None, owner_id))
+        if name is not None:
+            names[owner_id] = name
+        elif owner_id:
+            missing.append(owner_id)
+
+    users, errors = fan_out(request, keystone.user_get,
+                            [(owner_id,) for owner_id in missing])
+
+    for owner_id, user in zip(missing, users):
+        if user is not None:
+            names[owner_id] = user.name
+            _cache_set('owner', (None, owner_id), user.name)
+
+    return names
+
+
+# INVENTORY MIRROR
+# Entities mirrored besides the boards
+_MIRRORED_ENTITIES = ('fleet', 'plugin', 'service')
+
+
+def _mirror(kind, scope, resources, complete=True):
+    """Write the listed boards or resources to the inventory mirror, if
+    IOTRONIC_UI_INVENTORY_DB is set.
+    """
+    if not inventory_db.enabled():
+        return
+
+    infos = [getattr(resource, '_info', resource) for resource in resources]
+    try:
+        if kind == 'board':
+            inventory_db.store_boards(scope, infos)
+        else:
+            inventory_db.store_resources(kind, scope, infos, complete)
+    except Exception as e:
+        LOG.warning('Unable to update the %s inventory mirror: %r', kind, e)
+
+
+def _expire_mirror(kind):
+    """Stop serving the mirrored kind until it is listed again."""
+    if not inventory_db.enabled():
+        return
+
+    try:
+        inventory_db.expire(kind)
+    except Exception as e:
+        LOG.warning('Unable to expire the %s inventory mirror: %r', kind, e)
+
+
+def _mirrored_inventory(scope, with_versions):
+    """Rebuild a board inventory from the mirror, or None."""
+    if not inventory_db.enabled():
+        return None
+
+    try:
+        loaded_at = inventory_db.synced_at('board', scope)
+        infos = inventory_db.boards(scope) if loaded_at else None
+    except Exception as e:
+        LOG.warning('Unable to read the board inventory mirror: %r', e)
+        return None
+
+    if infos is None:
+        return None
+
+    versions = None
+    if with_versions:
+        versions = dict((info["uuid"], info.get("updated_at"))
+                        for info in infos)
+
+    inventory = _Inventory(('list', [('resource', iotronic_board.Board, info)
+                                     for info in infos]), versions)
+    inventory.loaded_at = inventory.enriched_at = loaded_at
+    return inventory
+
+
+def _mirror_synced(kind, scope):
+    """Whether the mirrored kind of scope is younger than
+    IOTRONIC_UI_BOARD_INVENTORY_MAX_AGE seconds.
+    """
+    if not inventory_db.enabled():
+        return False
+
+    max_age = getattr(settings, 'IOTRONIC_UI_BOARD_INVENTORY_MAX_AGE', 300)
+    try:
+        loaded_at = inventory_db.synced_at(kind, scope)
+    except Exception as e:
+        LOG.warning('Unable to read the %s inventory mirror: %r', kind, e)
+        return False
+
+    return bool(loaded_at) and time.time() - loaded_at < max_age
+
+
+def _mirrored_choices(request, kind):
+    """(uuid, name) of the mirrored kind, sorted by name, or None."""
+    scope = _role_scope(request)
+    if not _mirror_synced(kind, scope):
+        return None
+
+    try:
+        return inventory_db.resource_choices(kind, scope)
+    except Exception as e:
+        LOG.warning('Unable to read the %s inventory mirror: %r', kind, e)
+        return None
+
+
+def fleet_choices(request):
+    """(uuid, name) of the fleets, sorted by name.
+
+    The inventory mirror is used while younger than
+    IOTRONIC_UI_BOARD_INVENTORY_MAX_AGE seconds.
+    """
+    choices = _mirrored_choices(request, 'fleet')
+    if choices is None:
+        fleets = sorted(fleet_directory(request).values(),
+                        key=lambda fleet: fleet.name)
+        choices = [(fleet.uuid, fleet.name) for fleet in fleets]
+
+    return choices
+
+
+def service_choices(request):
+    """(uuid, name) of the services, sorted by name.
+
+    The inventory mirror is used while younger than
+    IOTRONIC_UI_BOARD_INVENTORY_MAX_AGE seconds.
+    """
+    choices = _mirrored_choices(request, 'service')
+    if choices is None:
+        services = sorted(service_catalog(request).values(),
+                          key=lambda service: service.name)
+        choices = [(service.uuid, service.name) for service in services]
+
+    return choices
+
+
+def board_choices(request, status=None):
+    """(uuid, name) of the boards, with the given status if any, sorted by
+    name.
+
+    The inventory mirror is used while younger than
+    IOTRONIC_UI_BOARD_INVENTORY_MAX_AGE seconds.
+    """
+    scope = _role_scope(request)
+    if _mirror_synced('board', scope):
+        try:
+            return inventory_db.board_choices(scope, status)
+        except Exception as e:
+            LOG.warning('Unable to read the board inventory mirror: %r', e)
+
+    boards = board_list(request, status, None, None, fields=NAME)
+    boards.sort(key=lambda b: b.name)
+    return [(board.uuid, board.name) for board in boards]
+
+
+def board_counts(request, column):
+    """Map the values of a board column, e.g. status, to the number of
+    boards, or None without an inventory mirror.
+    """
+    if not inventory_db.enabled():
+        return None
+
+    try:
+        return inventory_db.board_counts(_role_scope(request), column)
+    except Exception as e:
+        LOG.warning('Unable to read the board inventory mirror: %r', e)
+        return None
+
+
+# BOARD INVENTORY
+# Entities whose changes make the board inventory outdated
+_INVENTORY_ENTITIES = ('board', 'fleet', 'service')
+
+_INVENTORY = {}
+_INVENTORY_LOCK = threading.Lock()
+_INVENTORY_REFRESHING = set()
+# Bumped whenever the inventories are outdated, so that the refreshes
+# started before do not store outdated boards
+_INVENTORY_GENERATION = [0]
+
+
+def _outdate_inventories():
+    """Refresh every inventory at once, still serving it until then."""
+    with _INVENTORY_LOCK:
+        for inventory in _INVENTORY.values():
+            inventory.outdated = True
+        _INVENTORY_GENERATION[0] += 1
+
+    _expire_mirror('board')
+
+
+class _Inventory(object):
+    """Frozen boards with the updated_at of each board, by uuid.
+
+    tombstones maps the boards found deleted while syncing to the
+    updated_at they were listed with, so that they are not got again.
+    enriched_at is when all the boards were last enriched, as syncing only
+    enriches the changed ones. An outdated inventory is refreshed in full
+    on its next request.
+    """
+
+    def __init__(self, boards, versions=None, tombstones=None,
+                 enriched_at=None):
+        self.boards = boards
+        self.versions = versions
+        self.tombstones = tombstones or {}
+        self.loaded_at = time.time()
+        self.enriched_at = enriched_at or self.loaded_at
+        self.outdated = False
+
+
+def board_versions(request):
+    """Map the uuids of the boards to their updated_at."""
+    boards = iotronicclient(request).board.list(fields=['uuid', 'updated_at'])
+    return dict((board.uuid, board.updated_at) for board in boards)
+
+
+def _sync_inventory(request, inventory, enrich):
+    """Build a new inventory getting only the boards changed since the old
+    one, and dropping the deleted ones.
+    """
+    versions = board_versions(request)
+    tombstones = dict((board_id, updated_at)
+                      for board_id, updated_at in inventory.tombstones.items()
+                      if versions.get(board_id) == updated_at)
+
+    # The boards whose services were missing or late are enriched again
+    incomplete = set(board[2]["uuid"] for board in inventory.boards[1]
+                     if board[2].get("services") is None or
+                     board[2].get("services_stale"))
+
+    changed = [board_id for board_id, updated_at in versions.items()
+               if board_id not in tombstones and
+               (board_id not in inventory.versions or
+                inventory.versions[board_id] != updated_at or
+                board_id in incomplete)]
+
+    # The changed boards are got with the fields of the listed ones
+    boards, errors = fan_out(request, _board_get,
+                             [(board_id, _fields('board', SUMMARY))
+                              for board_id in changed])
+    for i, error in errors.items():
+        if not isinstance(error, iotronic_exc.NotFound):
+            raise error
+        # Deleted after being listed
+        tombstones[changed[i]] = versions[changed[i]]
+
+    boards = [board for board in boards if board is not None]
+    fresh = _freeze(enrich(request, boards))[1]
+    fresh_ids = set(board[2]["uuid"] for board in fresh)
+
+    merged = [board for board in inventory.boards[1]
+              if board[2]["uuid"] in versions and
+              board[2]["uuid"] not in fresh_ids and
+              board[2]["uuid"] not in tombstones] + fresh
+    merged.sort(key=lambda board: board[2].get("name") or "")
+
+    LOG.debug('Board inventory synced: %d changed, %d deleted',
+              len(fresh), len(inventory.boards[1]) + len(fresh) - len(merged))
+
+    for board_id in tombstones:
+        versions.pop(board_id, None)
+
+    return _Inventory(('list', merged), versions, tombstones,
+                      inventory.enriched_at)
+
+
+def _build_inventory(request, loader, enrich, old=None):
+    """Build the boards with loader(request), or sync the old inventory."""
+    max_age = getattr(settings, 'IOTRONIC_UI_BOARD_INVENTORY_MAX_AGE', 300)
+    if (enrich and old is not None and old.versions is not None and
+            not old.outdated and time.time() - old.enriched_at < max_age):
+        return _sync_inventory(request, old, enrich)
+
+    versions = board_versions(request) if enrich else None
+    return _Inventory(_freeze(loader(request)), versions)
+
+
+def _store_inventory(key, generation, inventory):
+    """Keep the inventory for the next requests, unless the inventories
+    were outdated since generation.
+    """
+    max_age = getattr(settings, 'IOTRONIC_UI_BOARD_INVENTORY_MAX_AGE', 300)
+    now = time.time()
+
+    with _INVENTORY_LOCK:
+        if generation != _INVENTORY_GENERATION[0]:
+            return
+
+        # Drop the inventories nobody asked for in a while
+        for old_key, old in list(_INVENTORY.items()):
+            if now - old.loaded_at >= max_age:
+                del _INVENTORY[old_key]
+        _INVENTORY[key] = inventory
+
+    _mirror('board', key, [board[2] for board in inventory.boards[1]])
+
+
+def _refresh_inventory(request, loader, enrich, key, generation, old):
+    """Rebuild the old inventory in background for the next requests.
+
+    The refresh runs in its own thread, not on the pool where its own
+    lookups run, and without the deadline of the request starting it.
+    """
+    request = _Detached(request)
+
+    def refresh():
+        try:
+            inventory = _build_inventory(request, loader, enrich, old)
+            if 'board' in degraded(request):
+                LOG.warning('IoTronic is not responding, the board '
+                            'inventory is not refreshed')
+            else:
+                _store_inventory(key, generation, inventory)
+        except Exception as e:
+            LOG.warning('Unable to refresh the board inventory: %r', e)
+        finally:
+            with _INVENTORY_LOCK:
+                _INVENTORY_REFRESHING.discard(key)
+
+    thread = threading.Thread(target=refresh, name='iotronic-ui-inventory')
+    thread.daemon = True
+    thread.start()
+
+
+def board_inventory(request, loader, enrich=None):
+    """Get the boards built by loader(request) and how old they are.
+
+    The boards are kept per project and roles, and are served at once while
+    younger than IOTRONIC_UI_BOARD_INVENTORY_MAX_AGE seconds. Older than
+    IOTRONIC_UI_BOARD_INVENTORY_REFRESH_AGE seconds, they are rebuilt in
+    background for the next requests, as they are as soon as boards, fleets
+    or services are changed. Returns a (boards, age in seconds) tuple.
+
+    With IOTRONIC_UI_BOARD_INVENTORY_SYNC and enrich, the background
+    refresh only gets the boards whose updated_at changed, enriching them
+    with enrich(request, boards) as loader(request) does. As the services
+    and fleet names of the others may have changed too, every board is
+    loaded again once enriched more than max age seconds before.
+
+    While the breaker of the endpoint is open, or once the deadline of the
+    request is over, the boards are served whatever their age. Boards
+    listed from last known data are not kept, nor taken for fresh ones;
+    the ones only enriched with last known services or fleets are.
+    """
+    max_age = getattr(settings, 'IOTRONIC_UI_BOARD_INVENTORY_MAX_AGE', 300)
+    refresh_age = getattr(settings, 'IOTRONIC_UI_BOARD_INVENTORY_REFRESH_AGE',
+                          15)
+    if not getattr(settings, 'IOTRONIC_UI_BOARD_INVENTORY_SYNC', False):
+        enrich = None
+
+    if not max_age:
+        return loader(request), 0
+
+    key = _role_scope(request)
+    now = time.time()
+
+    with _INVENTORY_LOCK:
+        inventory = _INVENTORY.get(key)
+        generation = _INVENTORY_GENERATION[0]
+
+    if inventory is None:
+        # Start from the mirror written before the last restart
+        inventory = _mirrored_inventory(key, enrich is not None)
+
+    # Served anyway when IoTronic can not answer in time
+    expired = inventory
+
+    with _INVENTORY_LOCK:
+        if inventory is not None and now - inventory.loaded_at >= max_age:
+            inventory = None
+        if inventory is not None and generation == _INVENTORY_GENERATION[0]:
+            _INVENTORY.setdefault(key, inventory)
+
+        refresh = (inventory is not None and
+                   (inventory.outdated or
+                    now - inventory.loaded_at >= refresh_age) and
+                   key not in _INVENTORY_REFRESHING)
+        if refresh:
+            _INVENTORY_REFRESHING.add(key)
+
+    if inventory is None:
+        try:
+            inventory = _build_inventory(request, loader, enrich)
+        except (CircuitOpen, DeadlineExceeded):
+            if expired is None:
+                raise
+            inventory = expired
+            _degraded(request).add('board')
+        else:
+            if 'board' not in degraded(request):
+                _store_inventory(key, generation, inventory)
+            elif expired is not None:
+                # Last known boards: no fresher than the expired ones
+                inventory.loaded_at = expired.loaded_at
+    elif refresh:
+        _refresh_inventory(request, loader, enrich, key, generation,
+                           inventory)
+
+    return _thaw(inventory.boards), max(0, int(now - inventory.loaded_at))
+
+
+# Fields of the boards table filter: the name is searched, the fleet is
+# given by name, the others must match
+BOARD_FILTERS = ('name', 'type', 'status', 'fleet', 'lr_version', 'owner')
+
+
+def _fleet_ids(request, name):
+    return [uuid for uuid, fleet in fleet_choices(request) if fleet == name]
+
+
+def _mirrored_matches(request, field, value):
+    """The boards of the mirror matching field and value with their age, or
+    None.
+    """
+    scope = _role_scope(request)
+    if not _mirror_synced('board', scope):
+        return None
+
+    if field == 'name':
+        filters = {'name_contains': value}
+    elif field == 'fleet':
+        filters = {'fleet': _fleet_ids(request, value)}
+    else:
+        filters = {field: value}
+
+    try:
+        loaded_at = inventory_db.synced_at('board', scope)
+        infos = inventory_db.boards(scope, **filters)
+    except Exception as e:
+        LOG.warning('Unable to read the board inventory mirror: %r', e)
+        return None
+
+    if not loaded_at:
+        return None
+
+    boards = _thaw(('list', [('resource', iotronic_board.Board, info)
+                             for info in infos]))
+    return boards, max(0, int(time.time() - loaded_at))
+
+
+def board_search(request, field, value, loader, enrich=None):
+    """Get the boards of board_inventory() matching the boards table filter.
+
+    field is one of BOARD_FILTERS. While younger than
+    IOTRONIC_UI_BOARD_INVENTORY_MAX_AGE seconds the inventory mirror is
+    queried, through its indexes, instead. Returns a (boards, age in
+    seconds) tuple.
+    """
+    if field not in BOARD_FILTERS:
+        raise ValueError(field)
+
+    found = _mirrored_matches(request, field, value)
+    if found is not None:
+        return found
+
+    boards, age = board_inventory(request, loader, enrich)
+    if field == 'name':
+        value = value.lower()
+        boards = [board for board in boards
+                  if value in (board.name or '').lower()]
+    elif field == 'fleet':
+        fleet_ids = _fleet_ids(request, value)
+        boards = [board for board in boards if board.fleet in fleet_ids]
+    else:
+        boards = [board for board in boards
+                  if getattr(board, field, None) == value]
+
+    return boards, age
+
+
+# BOARD DETAILS
+class _SizedLRU(object):
+    """LRU cache bounded by the pickled size of its values."""
 
-    endpoint = base.url_for(request, 'iot')
-    # insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
-    # cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
+    def __init__(self):
+        self._data = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
 
-    return iotronic_client.Client('1', endpoint, token=request.user.token.id)
+    def get(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return None
+            if entry[1] < time.time():
+                self._size -= len(entry[0])
+                return None
+
+            self._data[key] = entry
+            return pickle.loads(entry[0])
+
+    def set(self, key, value, ttl, max_size):
+        value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(value) > max_size:
+            return
+
+        with self._lock:
+            self._discard(key)
+            self._data[key] = (value, time.time() + ttl)
+            self._size += len(value)
+
+            while self._size > max_size:
+                self._size -= len(self._data.popitem(last=False)[1][0])
+
+    def _discard(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[0])
+
+    def discard_if(self, predicate):
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    def size(self):
+        with self._lock:
+            return self._size
+
+
+# Entities whose changes may rename what the board details show
+_BOARD_DETAIL_ENTITIES = ('fleet', 'plugin', 'service')
+
+_BOARD_DETAILS = _SizedLRU()
+
+# The tokens of the boards, and of all of them under None, are kept by the
+# configured backend, so that a change made in a Horizon process outdates
+# the boards cached by the others.
+_BOARD_DETAIL_TOKEN_TTL = 24 * 3600
+
+
+def _board_detail_token(board_id):
+    tokens = _cache('board_detail:token')
+    token = tokens.get((None, board_id))
+    if token is None:
+        token = _new_board_detail_token(board_id)
+
+    return token
+
+
+def _new_board_detail_token(board_id):
+    token = uuid.uuid4().hex
+    _cache('board_detail:token').set((None, board_id), token,
+                                     _BOARD_DETAIL_TOKEN_TTL)
+    return token
+
+
+@memoized
+def _board_detail_tokens(request, board_id):
+    # Read once per request, before the board is loaded: a change made
+    # while loading it outdates it.
+    return (_board_detail_token(None), _board_detail_token(board_id))
+
+
+def board_detail_get(request, board_id):
+    """Get the board enriched by the detail page, or None if not cached."""
+    if not _cache_ttl('board_detail'):
+        return None
+
+    entry = _BOARD_DETAILS.get((_cache_scope(request), board_id))
+    if entry is None or entry[0] != _board_detail_tokens(request, board_id):
+        return None
+
+    return _thaw(entry[1])
+
+
+def board_detail_set(request, board_id, board):
+    """Cache the board enriched by the detail page.
+
+    Boards are kept for IOTRONIC_UI_CACHE_TTL['board_detail'] seconds, up to
+    IOTRONIC_UI_BOARD_DETAIL_CACHE_SIZE bytes in all, and outdated by every
+    change made to them from the dashboard, in any Horizon process sharing
+    the IOTRONIC_UI_CACHE_BACKEND.
+    """
+    ttl = _cache_ttl('board_detail')
+    if ttl:
+        max_size = getattr(settings, 'IOTRONIC_UI_BOARD_DETAIL_CACHE_SIZE',
+                           4 * 1024 * 1024)
+        entry = (_board_detail_tokens(request, board_id), _freeze(board))
+        _BOARD_DETAILS.set((_cache_scope(request), board_id), entry, ttl,
+                           max_size)
+
+
+def _forget_board(board_id=None):
+    """Outdate the cached details of a board, or of all of them."""
+    _new_board_detail_token(board_id)
+    if board_id is None:
+        _BOARD_DETAILS.clear()
+    else:
+        _BOARD_DETAILS.discard_if(lambda key: key[1] == board_id)
+
+
+# EVENTS
+_EVENTS_CONNECTED = threading.Event()
+
+
+def events_connected(connected):
+    """Tell whether the IoTronic event stream is up.
+
+    While it is, the IOTRONIC_UI_EVENTS['cache_ttl'] TTLs replace the
+    IOTRONIC_UI_CACHE_TTL ones. Every change drops all the cached data, as
+    the events sent while the stream was down are lost, but the last known
+    data kept for when IoTronic is not responding.
+    """
+    if connected:
+        _EVENTS_CONNECTED.set()
+    else:
+        _EVENTS_CONNECTED.clear()
+
+    _invalidate(*[entity for entity in list(_CACHES)
+                  if not entity.startswith('stale:')])
+    _forget_board()
+    _outdate_inventories()
+
+
+def board_changed(board_id, status=None):
+    """Apply a board change reported by the IoTronic event stream.
+
+    The board lists and the details of the board are dropped; the board
+    inventories are patched with the new status if given, outdated if not.
+    """
+    _invalidate_cache('board')
+    _forget_board(board_id)
+
+    if status is None:
+        _outdate_inventories()
+        return
+
+    with _INVENTORY_LOCK:
+        for inventory in _INVENTORY.values():
+            for board in inventory.boards[1]:
+                if board[2].get("uuid") == board_id:
+                    board[2]["status"] = status
+
+    _expire_mirror('board')
+
+
+def entity_changed(entity, board_id=None):
+    """Apply a change of plugins, services, fleets, ports or web services
+    reported by the IoTronic event stream, on a board if given.
+    """
+    _invalidate(entity)
+    _forget_board(board_id)
+
+
+# REQUEST-SCOPED LOADER
+class _Loader(object):
+    """Memoize the boards, plugins, services or fleets got by a request.
+
+    Entities are memoized by id and fields. Ids are deduplicated and the
+    missing ones are fetched with concurrent get calls. Failed gets are not
+    memoized: they are tried again on the next lookup.
+    """
+
+    def __init__(self, get):
+        self._get = get
+        self._entities = {}
+        self._lock = threading.Lock()
+
+    def load(self, request, entity_id, fields=None):
+        key = (entity_id, _key_part(fields))
+        with self._lock:
+            entity = self._entities.get(key)
+
+        if entity is None:
+            entity = self._get(request, entity_id, fields)
+            with self._lock:
+                self._entities[key] = entity
+
+        return entity
+
+    def load_many(self, request, entity_ids, fields=None):
+        fields_key = _key_part(fields)
+        with self._lock:
+            missing = [entity_id for entity_id in OrderedDict.fromkeys(
+                entity_ids) if (entity_id, fields_key) not in self._entities]
+
+        if missing:
+            entities, errors = fan_out(request, self._get,
+                                       [(entity_id, fields)
+                                        for entity_id in missing])
+            with self._lock:
+                for entity_id, entity in zip(missing, entities):
+                    if entity is not None:
+                        self._entities[(entity_id, fields_key)] = entity
+
+        with self._lock:
+            return [self._entities.get((entity_id, fields_key))
+                    for entity_id in entity_ids]
+
+    def forget(self, entity_id):
+        with self._lock:
+            for key in [key for key in self._entities if key[0] == entity_id]:
+                del self._entities[key]
+
+
+@memoized
+def _loaders(request):
+    # NOTE: memoized keeps this only while the request is alive, so the
+    # loaders must not hold a reference to it.
+    return {'board': _Loader(_board_get),
+            'plugin': _Loader(_plugin_get),
+            'service': _Loader(_service_get),
+            'fleet': _Loader(_fleet_get)}
+
+
+def _loader(request, kind):
+    return _loaders(request)[kind]
+
+
+def load_many(request, kind, entity_ids, fields=None):
+    """Get many boards, plugins, services or fleets for the request.
+
+    kind is one of 'board', 'plugin', 'service' or 'fleet', fields a list
+    of fields, a projection, NAME or SUMMARY, or FULL. Returns the entities
+    in the order of entity_ids, with None for the ones that could not be
+    got; later lookups of the same request reuse them.
+    """
+    return _loader(request, kind).load_many(request, entity_ids,
+                                            _fields(kind, fields))
+
+
+# FIELD SETS
+# Projections of the resources, to be passed as the fields of the list and
+# get calls: NAME for the lookups of their names, SUMMARY for the tables.
+# FULL, or None, gets the whole resource, e.g. the code of a plugin.
+NAME = 'name'
+SUMMARY = 'summary'
+FULL = None
+
+_FIELD_SETS = {
+    'board': {NAME: ('uuid', 'name'),
+              SUMMARY: ('uuid', 'name', 'type', 'status', 'fleet',
+                        'lr_version', 'owner', 'updated_at')},
+    'fleet': {NAME: ('uuid', 'name'),
+              SUMMARY: ('uuid', 'name', 'description')},
+    'plugin': {NAME: ('uuid', 'name'),
+               SUMMARY: ('uuid', 'name', 'owner', 'public', 'callable')},
+    'service': {NAME: ('uuid', 'name'),
+                SUMMARY: ('uuid', 'name', 'port', 'protocol')},
+    'webservice': {NAME: ('uuid', 'name'),
+                   SUMMARY: ('uuid', 'name', 'port', 'board_uuid')},
+}
+
+
+def _fields(entity, fields):
+    """The field list of a projection of entity, or fields itself.
+
+    IOTRONIC_UI_FIELD_SETS overrides the field sets of the projections, a
+    None field set gets the whole resource.
+    """
+    if fields not in (NAME, SUMMARY):
+        return fields
+
+    overrides = getattr(settings, 'IOTRONIC_UI_FIELD_SETS', {})
+    field_set = overrides.get(entity, {}).get(
+        fields, _FIELD_SETS[entity][fields])
+
+    return list(field_set) if field_set is not None else None
 
 
 # BOARD MANAGEMENT
-def board_list(request, status=None, detail=None, project=None):
-    """List boards."""
-    return iotronicclient(request).board.list(status, detail, project)
+@_cached('board')
+def board_list(request, status=None, detail=None, project=None,
+               fields=None):
+    """List boards.
 
+    fields is a list of fields or a projection, NAME or SUMMARY.
+    """
+    return iotronicclient(request).board.list(
+        status, detail, project, fields=_fields('board', fields))
 
-def board_get(request, board_id, fields):
-    """Get board info."""
+
+@_remember_not_found('board')
+@_cached('board', uncached=_whole_resource)
+def _board_get(request, board_id, fields=None):
     return iotronicclient(request).board.get(board_id, fields)
 
 
+def board_get(request, board_id, fields):
+    """Get board info.
+
+    fields is a list of fields, a projection, NAME or SUMMARY, or FULL.
+    """
+    if fields is None:
+        return _loader(request, 'board').load(request, board_id)
+
+    return _board_get(request, board_id, _fields('board', fields))
+
+
 def board_create(request, code, mobile, location, type, name):
     """Create board."""
     params = {"code": code,
@@ -59,31 +1892,81 @@ def board_create(request, code, mobile, location, type, name):
               "type": type,
               "name": name}
     iotronicclient(request).board.create(**params)
+    _invalidate('board', 'not_found:board')
 
 
 def board_update(request, board_id, patch):
     """Update board."""
+    _loader(request, 'board').forget(board_id)
     iotronicclient(request).board.update(board_id, patch)
+    _invalidate('board')
+    _forget_board(board_id)
 
 
 def board_delete(request, board_id):
     """Delete board."""
+    _loader(request, 'board').forget(board_id)
     iotronicclient(request).board.delete(board_id)
+    _invalidate('board')
+    _forget_board(board_id)
 
 
 # PLUGIN MANAGEMENT (Cloud Side)
+def _lists_own_plugins(call):
+    # Without all_plugins IoTronic lists the plugins of the calling user
+    return not call['all_plugins']
+
+
+@_cached('plugin', owner_filtered=_lists_own_plugins)
 def plugin_list(request, detail=None, project=None, with_public=False,
-                all_plugins=False):
-    """List plugins."""
-    return iotronicclient(request).plugin.list(detail, project,
-                                               with_public=with_public,
-                                               all_plugins=all_plugins)
+                all_plugins=False, fields=None):
+    """List plugins.
+
+    fields is a list of fields or a projection, NAME or SUMMARY.
+    """
+    plugins = iotronicclient(request).plugin.list(detail, project,
+                                                  fields=_fields('plugin',
+                                                                 fields),
+                                                  with_public=with_public,
+                                                  all_plugins=all_plugins)
+    # The other listings depend on the user
+    if all_plugins and fields == SUMMARY:
+        _mirror('plugin', _role_scope(request), plugins)
+
+    return plugins
+
+
+@_remember_not_found('plugin')
+@_cached('plugin', uncached=_whole_resource)
+def _plugin_get(request, plugin_id, fields=None):
+    return iotronicclient(request).plugin.get(plugin_id, fields)
 
 
 def plugin_get(request, plugin_id, fields):
-    """Get plugin info."""
-    plugin = iotronicclient(request).plugin.get(plugin_id, fields)
-    return plugin
+    """Get plugin info.
+
+    fields is a list of fields, a projection, NAME or SUMMARY, or FULL.
+    """
+    if fields is None:
+        return _loader(request, 'plugin').load(request, plugin_id)
+
+    return _plugin_get(request, plugin_id, _fields('plugin', fields))
+
+
+@memoized
+def plugin_index(request):
+    """Map plugin uuids to plugins with a single plugin list call.
+
+    The index is shared by the whole request; plugins missing from it are
+    got one by one and added to it.
+    """
+    try:
+        plugins = plugin_list(request, all_plugins=True, fields=SUMMARY)
+    except Exception:
+        # Listing all the plugins is an admin only operation
+        plugins = plugin_list(request, with_public=True, fields=SUMMARY)
+
+    return dict((plugin.uuid, plugin) for plugin in plugins)
 
 
 def plugin_create(request, name, public, callable, code, parameters):
@@ -94,24 +1977,33 @@ def plugin_create(request, name, public, callable, code, parameters):
               "code": code,
               "parameters": parameters}
     iotronicclient(request).plugin.create(**params)
+    _invalidate('plugin', 'not_found:plugin')
 
 
 def plugin_update(request, plugin_id, patch):
     """Update plugin."""
+    _loader(request, 'plugin').forget(plugin_id)
     iotronicclient(request).plugin.update(plugin_id, patch)
+    _invalidate('plugin')
 
 
 def plugin_delete(request, plugin_id):
     """Delete plugin."""
-    return iotronicclient(request).plugin.delete(plugin_id)
+    _loader(request, 'plugin').forget(plugin_id)
+    deleted = iotronicclient(request).plugin.delete(plugin_id)
+    _invalidate('plugin')
+
+    return deleted
 
 
 # PLUGIN MANAGEMENT (Board Side)
 def plugin_inject(request, board_id, plugin_id, onboot):
     """Inject plugin on board(s)."""
-    return iotronicclient(request).plugin_injection.plugin_inject(board_id,
-                                                                  plugin_id,
-                                                                  onboot)
+    injected = iotronicclient(request).plugin_injection.plugin_inject(
+        board_id, plugin_id, onboot)
+    _forget_board(board_id)
+
+    return injected
 
 
 def plugin_action(request, board_id, plugin_id, action, params={}):
@@ -124,18 +2016,32 @@ def plugin_remove(request, board_id, plugin_id):
     """Remove plugin from board."""
     iotronicclient(request).plugin_injection.plugin_remove(board_id,
                                                            plugin_id)
+    _forget_board(board_id)
 
 
+@_last_known('plugin')
 def plugins_on_board(request, board_id):
     """Plugins on board."""
     plugins = iotronicclient(request).plugin_injection.plugins_on_board(
         board_id)
 
+    # The plugins missing from the index are got together
+    index = plugin_index(request)
+    missing = [plugin.plugin for plugin in plugins
+               if plugin.plugin not in index]
+    for plugin_id, details in zip(missing, load_many(request, 'plugin',
+                                                     missing, NAME)):
+        if details is not None:
+            index[plugin_id] = details
+
     detailed_plugins = []
-    # fields = {"name", "public", "callable"}
-    fields = {"name"}
     for plugin in plugins:
-        details = iotronicclient(request).plugin.get(plugin.plugin, fields)
+        details = index.get(plugin.plugin)
+        if details is None:
+            # Raises the error of the failed get
+            details = _loader(request, 'plugin').load(
+                request, plugin.plugin, _fields('plugin', NAME))
+
         detailed_plugins.append({"name": details._info["name"],
                                  "id": plugin.plugin})
 
@@ -143,34 +2049,71 @@ def plugins_on_board(request, board_id):
 
 
 # SERVICE MANAGEMENT
-def service_list(request, detail=None):
-    """List services."""
-    return iotronicclient(request).service.list(detail)
+@_cached('service')
+def service_list(request, detail=None, fields=None):
+    """List services.
 
+    fields is a list of fields or a projection, NAME or SUMMARY.
+    """
+    services = iotronicclient(request).service.list(
+        detail, fields=_fields('service', fields))
+    if fields == SUMMARY:
+        _mirror('service', _role_scope(request), services)
 
-def service_get(request, service_id, fields):
-    """Get service info."""
+    return services
+
+
+@memoized
+def service_catalog(request):
+    """Map service uuids to services with a single service list call.
+
+    The catalog is shared by the whole request.
+    """
+    return OrderedDict((service.uuid, service)
+                       for service in service_list(request, fields=SUMMARY))
+
+
+@_remember_not_found('service')
+@_cached('service', uncached=_whole_resource)
+def _service_get(request, service_id, fields=None):
     return iotronicclient(request).service.get(service_id, fields)
 
 
+def service_get(request, service_id, fields):
+    """Get service info.
+
+    fields is a list of fields, a projection, NAME or SUMMARY, or FULL.
+    """
+    if fields is None:
+        return _loader(request, 'service').load(request, service_id)
+
+    return _service_get(request, service_id, _fields('service', fields))
+
+
 def service_create(request, name, port, protocol):
     """Create service."""
     params = {"name": name,
               "port": port,
               "protocol": protocol}
     iotronicclient(request).service.create(**params)
+    _invalidate('service', 'not_found:service')
 
 
 def service_update(request, service_id, patch):
     """Update service."""
+    _loader(request, 'service').forget(service_id)
     iotronicclient(request).service.update(service_id, patch)
+    _invalidate('service')
 
 
 def service_delete(request, service_id):
     """Delete service."""
+    _loader(request, 'service').forget(service_id)
     iotronicclient(request).service.delete(service_id)
+    _invalidate('service')
 
 
+@_last_known('service')
 def services_on_board(request, board_id, detail=False):
     """List services on board."""
     services = iotronicclient(request).exposed_service.services_on_board(
@@ -178,11 +2121,23 @@ def services_on_board(request, board_id, detail=False):
 
     if detail:
         detailed_services = []
-        fields = {"name", "port", "protocol"}
+        fields = _fields('service', SUMMARY)
+        catalog = dict(service_catalog(request))
+
+        # The services missing from the catalog are got together
+        missing = [service._info["service"] for service in services
+                   if service._info["service"] not in catalog]
+        for service_id, details in zip(missing, load_many(
+                request, 'service', missing, fields)):
+            if details is not None:
+                catalog[service_id] = details
 
         for service in services:
-            details = iotronicclient(request).service.get(
-                service._info["service"], fields)
+            details = catalog.get(service._info["service"])
+            if details is None:
+                # Raises the error of the failed get
+                details = _loader(request, 'service').load(
+                    request, service._info["service"], fields)
 
             detailed_services.append({"uuid": service._info["service"],
                                       "name": details._info["name"],
@@ -199,93 +2154,192 @@ def services_on_board(request, board_id, detail=False):
 
 def service_action(request, board_id, service_id, action):
     """Action on service."""
-    return iotronicclient(request).exposed_service.service_action(board_id,
-                                                                  service_id,
-                                                                  action)
+    result = iotronicclient(request).exposed_service.service_action(
+        board_id, service_id, action)
+    _invalidate('board')
+    _forget_board(board_id)
+
+    return result
 
 
 def restore_services(request, board_id):
     """Restore services."""
-    return iotronicclient(request).exposed_service.restore_services(board_id)
+    result = iotronicclient(request).exposed_service.restore_services(
+        board_id)
+    _invalidate('board')
+    _forget_board(board_id)
+
+    return result
 
 
 # PORTS MANAGEMENT
+_PORT_INDEX = ('_port_index', (), ())
+
+
+def _index_ports(ports):
+    index = {}
+    for port in ports:
+        index.setdefault(port._info["board_uuid"], []).append(_freeze(port))
+
+    return dict((board_id, ('list', ports))
+                for board_id, ports in index.items())
+
+
+@memoized
+def _port_index(request):
+    """Map board uuids to their frozen ports with a single port list call.
+
+    The Iotronic API can only list the ports of the whole cloud, so the
+    listing is grouped by board once and cached grouped, for
+    IOTRONIC_UI_CACHE_TTL['port'] seconds: a board page only copies its own
+    ports out of it. The index is shared, it must not be changed.
+    """
+    def load():
+        return _index_ports(iotronicclient(request).port.list())
+
+    return _cache_get_or_load('port', _cache_scope(request) + _PORT_INDEX,
+                              _role_scope(request) + _PORT_INDEX, load,
+                              _deadline(request))
+
+
+@_last_known('port')
 def port_list(request, board_id):
     """Get ports attached to a board."""
-    return iotronicclient(request).port.list()
+    return _thaw(_port_index(request).get(board_id, ('list', [])))
 
 
 def attach_port(request, board_id, network_id, subnet_id):
     """Attach port to a subnet for a board."""
-    return iotronicclient(request).portonboard.attach_port(board_id,
+    port = iotronicclient(request).portonboard.attach_port(board_id,
                                                            network_id,
                                                            subnet_id)
+    _invalidate('port')
+    _forget_board(board_id)
+
+    return port
 
 
 def detach_port(request, board_id, port_id):
     """Detach port from the board."""
     iotronicclient(request).portonboard.detach_port(board_id, port_id)
+    _invalidate('port')
+    _forget_board(board_id)
 
 
 # FLEETS MANAGEMENT
-def fleet_list(request, detail=None):
-    """Get fleets list."""
-    return iotronicclient(request).fleet.list()
+@_cached('fleet')
+def fleet_list(request, detail=None, fields=None):
+    """Get fleets list.
 
+    fields is a list of fields or a projection, NAME or SUMMARY.
+    """
+    fleets = iotronicclient(request).fleet.list(
+        fields=_fields('fleet', fields))
+    if fields == SUMMARY:
+        _mirror('fleet', _role_scope(request), fleets)
 
-def fleet_get(request, fleet_id, fields):
-    """Get fleet info."""
+    return fleets
+
+
+@memoized
+def fleet_directory(request):
+    """Map fleet uuids to fleets with a single fleet list call.
+
+    The map is shared by the whole request.
+    """
+    return dict((fleet.uuid, fleet)
+                for fleet in fleet_list(request, fields=SUMMARY))
+
+
+def fleet_name(request, fleet_id):
+    """Get the name of a fleet from the fleet directory."""
+    if fleet_id is None:
+        return None
+
+    fleet = fleet_directory(request).get(fleet_id)
+    return fleet.name if fleet is not None else None
+
+
+@_remember_not_found('fleet')
+@_cached('fleet', uncached=_whole_resource)
+def _fleet_get(request, fleet_id, fields=None):
     return iotronicclient(request).fleet.get(fleet_id, fields)
 
 
+def fleet_get(request, fleet_id, fields):
+    """Get fleet info.
+
+    fields is a list of fields, a projection, NAME or SUMMARY, or FULL.
+    """
+    if fields is None:
+        return _loader(request, 'fleet').load(request, fleet_id)
+
+    return _fleet_get(request, fleet_id, _fields('fleet', fields))
+
+
 def fleet_create(request, name, description):
     """Create fleet."""
     params = {"name": name,
               "description": description}
 
     iotronicclient(request).fleet.create(**params)
+    _invalidate('fleet', 'not_found:fleet')
 
 
 def fleet_delete(request, fleet_id):
     """Delete fleet."""
+    _loader(request, 'fleet').forget(fleet_id)
     iotronicclient(request).fleet.delete(fleet_id)
+    _invalidate('fleet', 'board')
 
 
 def fleet_update(request, fleet_id, patch):
     """Update fleet."""
+    _loader(request, 'fleet').forget(fleet_id)
     iotronicclient(request).fleet.update(fleet_id, patch)
+    _invalidate('fleet')
 
 
+@_cached('board')
 def fleet_get_boards(request, fleet_id):
     """Get fleet boards."""
     return iotronicclient(request).fleet.boards_in_fleet(fleet=fleet_id)
 
 
 # WEBSERVICES MANAGEMENT
-def webservice_list(request, detail=None):
-    """Get web services list."""
-    return iotronicclient(request).webservice.list()
+@_cached('webservice')
+def webservice_list(request, detail=None, fields=None):
+    """Get web services list.
 
+    fields is a list of fields or a projection, NAME or SUMMARY.
+    """
+    return iotronicclient(request).webservice.list(
+        fields=_fields('webservice', fields))
 
+
+@_cached('webservice')
 def webservice_enabled_list(request):
     """Get enabled web services list."""
     return iotronicclient(request).enabledwebservice.list()
 
 
-def webservice_get_enabled_info(request, board_id, detail=None):
-    """Get the information of the enabled webservices."""
-    ws_info = []
+@memoized
+def webservice_enabled_index(request):
+    """Map board uuids to their enabled web services manager.
 
-    ws_enabled = iotronicclient(request).enabledwebservice.list()
+    The index is built with a single enabled web services list call and
+    shared by the whole request.
+    """
+    return dict((ws.board_uuid, ws)
+                for ws in webservice_enabled_list(request))
 
-    for ws in ws_enabled:
-        if ws.board_uuid == board_id:
-            ws_info = ws
-            break
 
-    return ws_info
+def webservice_get_enabled_info(request, board_id, detail=None):
+    """Get the information of the enabled webservices."""
+    return webservice_enabled_index(request).get(board_id, [])
 
 
+@_last_known('webservice')
 def webservices_on_board(request, board_id, fields=None):
     """Get web services on board list."""
     webservices = iotronicclient(request).webserviceonboard.list(board_id,
@@ -302,54 +2356,70 @@ def webservices_on_board(request, board_id, fields=None):
     return detailed_webservices
 
 
+@_remember_not_found('webservice')
+@_cached('webservice', uncached=_whole_resource)
 def webservice_get(request, webservice_id, fields):
-    """Get web service info."""
-    return iotronicclient(request).webservice.get(webservice_id, fields)
+    """Get web service info.
+
+    fields is a list of fields, a projection, NAME or SUMMARY, or FULL.
+    """
+    return iotronicclient(request).webservice.get(
+        webservice_id, _fields('webservice', fields))
 
 
 def webservice_expose(request, board_id, name, port, secure):
     """Expose a web service."""
-    return iotronicclient(request).webserviceonboard.expose(board_id,
-                                                            name,
-                                                            port,
-                                                            secure)
+    exposed = iotronicclient(request).webserviceonboard.expose(board_id,
+                                                               name,
+                                                               port,
+                                                               secure)
+    _invalidate('webservice', 'not_found:webservice')
+    _forget_board(board_id)
+
+    return exposed
 
 
 def webservice_unexpose(request, webservice_id):
     """Unexpose a web service from a board."""
-    return iotronicclient(request).webservice.delete(webservice_id)
+    unexposed = iotronicclient(request).webservice.delete(webservice_id)
+    _invalidate('webservice')
+    # The board of the web service is not known here
+    _forget_board()
+
+    return unexposed
 
 
 def webservice_enable(request, board, dns, zone, email):
     """Enable web service."""
-    return iotronicclient(request).webserviceonboard.enable_webservice(board,
-                                                                       dns,
-                                                                       zone,
-                                                                       email)
+    enabled = iotronicclient(request).webserviceonboard.enable_webservice(
+        board, dns, zone, email)
+    _invalidate('webservice')
+    _forget_board(board)
+
+    return enabled
 
 
 def webservice_disable(request, board):
     """Disable web service."""
-    return iotronicclient(request).webserviceonboard.disable_webservice(board)
+    disabled = iotronicclient(request).webserviceonboard.disable_webservice(
+        board)
+    _invalidate('webservice')
+    _forget_board(board)
+
+    return disabled
 
 
 def boards_no_webservice(request):
     """Get all the boards that have not webservice enabled."""
 
-    boards_no_ws_enabled = []
+    boards = board_list(request, fields=NAME)
+    boards.sort(key=lambda b: b.name)
 
-    board_list = iotronicclient(request).board.list()
-    board_list.sort(key=lambda b: b.name)
+    enabled = webservice_enabled_index(request)
 
-    board_ws_list = iotronicclient(request).enabledwebservice.list()
-
-    for board in board_list:
-        for i in range(len(board_ws_list)):
-            if board.uuid == board_ws_list[i].board_uuid:
-                break
-            elif ((board.uuid != board_ws_list[i].board_uuid) and
-                 (i==len(board_ws_list)-1)):
-                boards_no_ws_enabled.append((board.uuid, _(board.name)))
+    boards_no_ws_enabled = [(board.uuid, _(board.name))
+                            for board in boards
+                            if board.uuid not in enabled]
 
     # LOG.debug('COMPLEMENTARY %s', boards_no_ws_enabled)
     return boards_no_ws_enabled
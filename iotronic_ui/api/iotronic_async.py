@@ -0,0 +1,653 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Asyncio variant of the IoTronic API wrapper, for Python 3 only.
+
+Its coroutines get boards, plugins, services, ports, fleets and web
+services, and run the board actions of the bulk forms, as the functions of
+the same name of openstack_dashboard.api.iotronic do: they share their
+caches, last known results, circuit breakers and request deadlines, but
+send their HTTP calls through aiohttp rather than the blocking IoTronic
+client. gather() runs a set of them at once on an event loop of the
+calling thread, without taking the workers of the pool.
+
+With IOTRONIC_UI_ASYNC, call_concurrently() hands its calls over to
+gather() when each of them has a variant here. It needs aiohttp.
+"""
+
+import asyncio
+from concurrent import futures
+import functools
+import json
+import ssl
+import threading
+import time
+
+from django.conf import settings
+from iotronicclient import exc as iotronic_exc
+from iotronicclient.v1 import board as iotronic_board
+from iotronicclient.v1 import exposed_service as iotronic_exposed
+from iotronicclient.v1 import fleet as iotronic_fleet
+from iotronicclient.v1 import plugin as iotronic_plugin
+from iotronicclient.v1 import plugin_injection as iotronic_injection
+from iotronicclient.v1 import port as iotronic_port
+from iotronicclient.v1 import service as iotronic_service
+from iotronicclient.v1 import webservice as iotronic_webservice
+from keystoneauth1 import exceptions as ks_exc
+
+from openstack_dashboard.api import iotronic
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+def available():
+    return aiohttp is not None
+
+
+# CLIENT
+class _Response(object):
+    """What iotronic_exc.from_response() reads of a response."""
+
+    def __init__(self, status, headers):
+        self.status_code = status
+        self.headers = headers
+
+
+def _error(method, url, status, headers, text):
+    """The error the IoTronic client raises for a failed call."""
+    try:
+        error = json.loads(json.loads(text)['error_message'])
+    except (ValueError, KeyError, TypeError):
+        error = {}
+    if not isinstance(error, dict):
+        error = {}
+
+    return iotronic_exc.from_response(
+        _Response(status, headers),
+        error.get('faultstring') or error.get('description'),
+        error.get('debuginfo'), method, url)
+
+
+def _base_url(endpoint):
+    # The paths start with the API version, as the ones of the client
+    url = endpoint.rstrip('/')
+    return url[:-len('/v1')] if url.endswith('/v1') else url
+
+
+class AsyncClient(object):
+    """IoTronic API client of a request, sending through an aiohttp session.
+
+    As iotronicclient(request), it sends the token of the request to the
+    endpoint of its project, guarded by the circuit breaker of the endpoint
+    and bounded by the deadline of the request. What the blocking API
+    memoizes for the request, e.g. the service catalog, is got once per
+    client.
+    """
+
+    def __init__(self, request, session):
+        self.request = request
+        self.session = session
+        self.endpoint = iotronic._endpoint(request)
+        self._url = _base_url(self.endpoint)
+        self._headers = {'X-Auth-Token': request.user.token.id,
+                         'Accept': 'application/json',
+                         'Content-Type': 'application/json'}
+        self._deadline = iotronic._deadline(request)
+        self._breaker = None
+        if iotronic._breaker_config()['failures']:
+            self._breaker = iotronic._breaker(self.endpoint)
+        self._memo = {}
+
+    def once(self, coro_func):
+        """Await coro_func(self) once for all the callers."""
+        if coro_func not in self._memo:
+            self._memo[coro_func] = asyncio.ensure_future(coro_func(self))
+
+        # A caller cancelled does not cancel the others
+        return asyncio.shield(self._memo[coro_func])
+
+    def cancel(self):
+        for task in self._memo.values():
+            task.cancel()
+
+        return asyncio.gather(*self._memo.values(), return_exceptions=True)
+
+    async def send(self, method, path, body=None):
+        """Send method path, returning the decoded JSON body or None."""
+        timeout = getattr(settings, 'IOTRONIC_UI_HTTP_TIMEOUT', 60)
+        remaining = self._deadline.remaining()
+        bounded = remaining is not None and (
+            not timeout or remaining < timeout)
+        if bounded:
+            if remaining <= 0:
+                raise iotronic.DeadlineExceeded(
+                    'No time left to call IoTronic')
+            timeout = remaining
+
+        read = method == 'GET'
+        probe = self._breaker._before_call(read) if self._breaker else None
+        started = time.time()
+        failed = True
+        try:
+            status, headers, text = await self._send(method, path, body,
+                                                     timeout)
+            failed = status >= 500
+        except asyncio.TimeoutError:
+            # Maybe cut short by the deadline: it counts as a failure only
+            # if it ran for slow_call seconds
+            failed = False
+            if bounded:
+                raise iotronic.DeadlineExceeded(
+                    'IoTronic did not answer in time')
+            raise ks_exc.ConnectTimeout('IoTronic did not answer in %s '
+                                        'seconds' % timeout)
+        except aiohttp.ClientError as e:
+            raise ks_exc.ConnectFailure('Unable to reach IoTronic at %s: '
+                                        '%s' % (self.endpoint, e))
+        finally:
+            if self._breaker is not None:
+                self._breaker._after_call(probe, failed,
+                                          time.time() - started, read)
+
+        if status >= 400:
+            raise _error(method, self._url + path, status, headers, text)
+
+        return json.loads(text) if text else None
+
+    async def _send(self, method, path, body, timeout):
+        data = None if body is None else json.dumps(body)
+        async with self.session.request(
+                method, self._url + path, data=data, headers=self._headers,
+                timeout=aiohttp.ClientTimeout(total=timeout or None)) as r:
+            return r.status, r.headers, await r.text()
+
+    async def list(self, resource_class, path, response_key):
+        body = await self.send('GET', path)
+        data = body.get(response_key, []) if isinstance(body, dict) else []
+        if not isinstance(data, list):
+            data = [data]
+
+        return [resource_class(None, info, loaded=True)
+                for info in data if info]
+
+    async def get(self, resource_class, path):
+        return resource_class(None, await self.send('GET', path),
+                              loaded=True)
+
+    async def update(self, resource_class, path, body, method):
+        result = await self.send(method, path, body)
+        # As the client: a resource if the answer is one, else the answer
+        if result:
+            try:
+                return resource_class(None, result)
+            except Exception:
+                return result
+
+
+def _path(resource, path=''):
+    return '/v1/%s/%s' % (resource, path) if path else '/v1/%s' % resource
+
+
+def _list_path(resource, detail, query):
+    return _path(resource, ('detail' if detail else '') + query)
+
+
+def _query(fields=None, **filters):
+    params = ['%s=%s' % (name, value)
+              for name, value in sorted(filters.items())
+              if value is not None]
+    if fields is not None:
+        params.append('fields=%s' % ','.join(fields))
+
+    return '?' + '&'.join(params) if params else ''
+
+
+# SHARED CACHES
+def _sharing(sync_func):
+    """Share the cache and last known results of sync_func, a _cached or
+    _last_known function of the blocking API, with its variant.
+
+    The calls of the variant are keyed as the calls of sync_func made with
+    the same arguments.
+    """
+    entity = sync_func.stale_entity
+
+    def decorator(coro_func):
+        @functools.wraps(coro_func)
+        async def wrapper(client, *args, **kwargs):
+            request = client.request
+            key = None
+            if hasattr(sync_func, 'cache_key'):
+                key = sync_func.cache_key(request, args, kwargs)
+            if key is not None:
+                frozen = iotronic._cache_get(entity, key)
+                if frozen is not None:
+                    return iotronic._thaw(frozen)
+
+            stale_key = sync_func.stale_key(request, args, kwargs)
+            generation = iotronic._cache_generation(entity)
+            try:
+                frozen = iotronic._freeze(
+                    await coro_func(client, *args, **kwargs))
+            except (iotronic.CircuitOpen, iotronic.DeadlineExceeded):
+                frozen = iotronic._stale_get(request, entity, stale_key)
+                if frozen is None:
+                    raise
+                return iotronic._thaw(frozen)
+
+            iotronic._stale_set(entity, stale_key, frozen)
+            # Invalidated meanwhile, it may be outdated
+            if (key is not None and
+                    iotronic._cache_generation(entity) == generation):
+                iotronic._cache_set(entity, key, frozen)
+
+            return iotronic._thaw(frozen)
+
+        return wrapper
+
+    return decorator
+
+
+def _remembering_not_found(entity):
+    """Remember the entity ids IoTronic could not find, as the blocking API.
+    """
+    def decorator(coro_func):
+        @functools.wraps(coro_func)
+        async def wrapper(client, entity_id, *args, **kwargs):
+            ttl = iotronic._cache_ttl('not_found')
+            if not ttl:
+                return await coro_func(client, entity_id, *args, **kwargs)
+
+            cache = iotronic._cache('not_found:' + entity)
+            key = (client.request.user.project_id, entity_id)
+            message = cache.get(key)
+            if message is not None:
+                iotronic._cache_count('not_found:' + entity, 'hits')
+                raise iotronic_exc.NotFound(message)
+
+            try:
+                return await coro_func(client, entity_id, *args, **kwargs)
+            except iotronic_exc.NotFound as e:
+                cache.set(key, e.message or '', ttl)
+                raise
+
+        return wrapper
+
+    return decorator
+
+
+# BOARDS
+@_sharing(iotronic.board_list)
+async def board_list(client, status=None, detail=None, project=None,
+                     fields=None):
+    query = _query(iotronic._fields('board', fields), status=status,
+                   project=project)
+    return await client.list(iotronic_board.Board,
+                             _list_path('boards', detail, query), 'boards')
+
+
+@_remembering_not_found('board')
+@_sharing(iotronic._board_get)
+async def _board_get(client, board_id, fields=None):
+    return await client.get(iotronic_board.Board,
+                            _path('boards', board_id + _query(fields)))
+
+
+async def board_get(client, board_id, fields):
+    return await _board_get(client, board_id,
+                            iotronic._fields('board', fields))
+
+
+# PLUGINS
+@_sharing(iotronic.plugin_list)
+async def plugin_list(client, detail=None, project=None, with_public=False,
+                      all_plugins=False, fields=None):
+    query = _query(iotronic._fields('plugin', fields),
+                   with_public='true' if with_public else None,
+                   all_plugins='true' if all_plugins else None)
+    plugins = await client.list(iotronic_plugin.Plugin,
+                                _list_path('plugins', detail, query),
+                                'plugins')
+    # The other listings depend on the user
+    if all_plugins and fields == iotronic.SUMMARY:
+        iotronic._mirror('plugin', iotronic._role_scope(client.request),
+                         plugins)
+
+    return plugins
+
+
+@_remembering_not_found('plugin')
+@_sharing(iotronic._plugin_get)
+async def _plugin_get(client, plugin_id, fields=None):
+    return await client.get(iotronic_plugin.Plugin,
+                            _path('plugins', plugin_id + _query(fields)))
+
+
+async def plugin_get(client, plugin_id, fields):
+    return await _plugin_get(client, plugin_id,
+                             iotronic._fields('plugin', fields))
+
+
+async def _plugin_index(client):
+    try:
+        plugins = await plugin_list(client, all_plugins=True,
+                                    fields=iotronic.SUMMARY)
+    except Exception:
+        # Listing all the plugins is an admin only operation
+        plugins = await plugin_list(client, with_public=True,
+                                    fields=iotronic.SUMMARY)
+
+    return dict((plugin.uuid, plugin) for plugin in plugins)
+
+
+async def plugin_inject(client, board_id, plugin_id, onboot):
+    injected = await client.update(
+        iotronic_injection.InjectionPlugin,
+        _path('boards', '%s/plugins' % board_id),
+        {"plugin": plugin_id, "onboot": onboot}, 'PUT')
+    iotronic._forget_board(board_id)
+
+    return injected
+
+
+async def plugin_action(client, board_id, plugin_id, action, params={}):
+    return await client.update(
+        iotronic_injection.InjectionPlugin,
+        _path('boards', '%s/plugins/%s' % (board_id, plugin_id)),
+        {"action": action, "parameters": params}, 'POST')
+
+
+async def plugin_remove(client, board_id, plugin_id):
+    await client.send('DELETE', _path('boards', '%s/plugins/%s' %
+                                      (board_id, plugin_id)))
+    iotronic._forget_board(board_id)
+
+
+@_sharing(iotronic.plugins_on_board)
+async def plugins_on_board(client, board_id):
+    plugins, index = await asyncio.gather(
+        client.list(iotronic_injection.InjectionPlugin,
+                    _path('boards', '%s/plugins' % board_id), 'injections'),
+        client.once(_plugin_index))
+
+    # The plugins missing from the index are got together
+    missing = sorted(set(plugin.plugin for plugin in plugins
+                         if plugin.plugin not in index))
+    found = await asyncio.gather(*[
+        plugin_get(client, plugin_id, iotronic.NAME)
+        for plugin_id in missing])
+    index = dict(index, **dict(zip(missing, found)))
+
+    return [{"name": index[plugin.plugin]._info["name"],
+             "id": plugin.plugin} for plugin in plugins]
+
+
+# SERVICES
+@_sharing(iotronic.service_list)
+async def service_list(client, detail=None, fields=None):
+    query = _query(iotronic._fields('service', fields))
+    services = await client.list(iotronic_service.Service,
+                                 _list_path('services', detail, query),
+                                 'services')
+    if fields == iotronic.SUMMARY:
+        iotronic._mirror('service', iotronic._role_scope(client.request),
+                         services)
+
+    return services
+
+
+async def _service_catalog(client):
+    services = await service_list(client, fields=iotronic.SUMMARY)
+    return dict((service.uuid, service) for service in services)
+
+
+@_remembering_not_found('service')
+@_sharing(iotronic._service_get)
+async def _service_get(client, service_id, fields=None):
+    return await client.get(iotronic_service.Service,
+                            _path('services', service_id + _query(fields)))
+
+
+async def service_get(client, service_id, fields):
+    return await _service_get(client, service_id,
+                              iotronic._fields('service', fields))
+
+
+@_sharing(iotronic.services_on_board)
+async def services_on_board(client, board_id, detail=False):
+    services = await client.list(iotronic_exposed.ExposedService,
+                                 _path('boards', '%s/services' % board_id),
+                                 'exposed')
+    if not detail:
+        return services
+
+    catalog = await client.once(_service_catalog)
+
+    # The services missing from the catalog are got together
+    missing = sorted(set(service._info["service"] for service in services
+                         if service._info["service"] not in catalog))
+    found = await asyncio.gather(*[
+        service_get(client, service_id, iotronic.SUMMARY)
+        for service_id in missing])
+    catalog = dict(catalog, **dict(zip(missing, found)))
+
+    detailed_services = []
+    for service in services:
+        details = catalog[service._info["service"]]
+        detailed_services.append({"uuid": service._info["service"],
+                                  "name": details._info["name"],
+                                  "public_port":
+                                      service._info["public_port"],
+                                  "port": details._info["port"],
+                                  "protocol": details._info["protocol"]})
+
+    return detailed_services
+
+
+async def service_action(client, board_id, service_id, action):
+    result = await client.update(
+        iotronic_exposed.ExposedService,
+        _path('boards', '%s/services/%s/action' % (board_id, service_id)),
+        {"action": action}, 'POST')
+    iotronic._invalidate('board')
+    iotronic._forget_board(board_id)
+
+    return result
+
+
+# PORTS
+async def _port_index(client):
+    key = iotronic._cache_scope(client.request) + iotronic._PORT_INDEX
+    index = iotronic._cache_get('port', key)
+    if index is None:
+        generation = iotronic._cache_generation('port')
+        index = iotronic._index_ports(await client.list(
+            iotronic_port.Port, _path('ports'), 'ports'))
+        if iotronic._cache_generation('port') == generation:
+            iotronic._cache_set('port', key, index)
+
+    return index
+
+
+@_sharing(iotronic.port_list)
+async def port_list(client, board_id):
+    index = await client.once(_port_index)
+    return iotronic._thaw(index.get(board_id, ('list', [])))
+
+
+async def detach_port(client, board_id, port_id):
+    await client.send('DELETE', _path('boards', '%s/ports/%s' %
+                                      (board_id, port_id)))
+    iotronic._invalidate('port')
+    iotronic._forget_board(board_id)
+
+
+# FLEETS
+@_sharing(iotronic.fleet_list)
+async def fleet_list(client, detail=None, fields=None):
+    query = _query(iotronic._fields('fleet', fields))
+    fleets = await client.list(iotronic_fleet.Fleet,
+                               _list_path('fleets', None, query), 'fleets')
+    if fields == iotronic.SUMMARY:
+        iotronic._mirror('fleet', iotronic._role_scope(client.request),
+                         fleets)
+
+    return fleets
+
+
+async def _fleet_directory(client):
+    fleets = await fleet_list(client, fields=iotronic.SUMMARY)
+    return dict((fleet.uuid, fleet) for fleet in fleets)
+
+
+async def fleet_directory(client):
+    return await client.once(_fleet_directory)
+
+
+# WEB SERVICES
+@_sharing(iotronic.webservice_list)
+async def webservice_list(client, detail=None, fields=None):
+    query = _query(iotronic._fields('webservice', fields))
+    return await client.list(iotronic_webservice.WebService,
+                             _list_path('webservices', None, query),
+                             'webservices')
+
+
+@_sharing(iotronic.webservice_enabled_list)
+async def webservice_enabled_list(client):
+    return await client.list(iotronic_webservice.EnabledWebservice,
+                             _path('enabledwebservices'),
+                             'EnabledWebservices')
+
+
+@_sharing(iotronic.webservices_on_board)
+async def webservices_on_board(client, board_id, fields=None):
+    webservices = await client.list(
+        iotronic_webservice.WebService,
+        _path('boards', '%s/webservices' % board_id), 'webservices')
+
+    return [{"name": ws._info["name"],
+             "port": ws._info["port"],
+             "uuid": ws._info["uuid"]} for ws in webservices]
+
+
+async def webservice_unexpose(client, webservice_id):
+    unexposed = await client.send('DELETE',
+                                  _path('webservices', webservice_id))
+    iotronic._invalidate('webservice')
+    # The board of the web service is not known here
+    iotronic._forget_board()
+
+    return unexposed
+
+
+# The variants of the functions of the blocking API
+VARIANTS = {
+    iotronic.board_list: board_list,
+    iotronic.board_get: board_get,
+    iotronic.plugin_list: plugin_list,
+    iotronic.plugin_get: plugin_get,
+    iotronic.plugin_inject: plugin_inject,
+    iotronic.plugin_action: plugin_action,
+    iotronic.plugin_remove: plugin_remove,
+    iotronic.plugins_on_board: plugins_on_board,
+    iotronic.service_list: service_list,
+    iotronic.service_get: service_get,
+    iotronic.services_on_board: services_on_board,
+    iotronic.service_action: service_action,
+    iotronic.port_list: port_list,
+    iotronic.detach_port: detach_port,
+    iotronic.fleet_list: fleet_list,
+    iotronic.fleet_directory: fleet_directory,
+    iotronic.webservice_list: webservice_list,
+    iotronic.webservice_enabled_list: webservice_enabled_list,
+    iotronic.webservices_on_board: webservices_on_board,
+    iotronic.webservice_unexpose: webservice_unexpose,
+}
+
+
+def covers(calls):
+    """Whether each (func, args) pair of calls has a variant."""
+    return all(func in VARIANTS for func, args in calls)
+
+
+# EVENT LOOPS
+# Every thread keeps its loop and session, and the connections of the
+# session alive between its requests
+_THREAD = threading.local()
+
+
+def _ssl():
+    if getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False):
+        return False
+
+    cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
+    return ssl.create_default_context(cafile=cacert) if cacert else True
+
+
+def _loop():
+    if getattr(_THREAD, 'loop', None) is None:
+        loop = asyncio.new_event_loop()
+
+        async def session():
+            return aiohttp.ClientSession(connector=aiohttp.TCPConnector(
+                limit=getattr(settings, 'IOTRONIC_UI_HTTP_POOL_SIZE', 10),
+                ssl=_ssl()))
+
+        _THREAD.session = loop.run_until_complete(session())
+        _THREAD.loop = loop
+
+    return _THREAD.loop, _THREAD.session
+
+
+def gather(request, calls, timeout=None, deadline=None):
+    """Run the variants of the (func, args) pairs of calls at once.
+
+    Returns their results and errors as iotronic.call_concurrently(): the
+    calls still running after timeout seconds, or at deadline, a
+    time.time() value, are cancelled and fail with futures.TimeoutError.
+    """
+    loop, session = _loop()
+    return loop.run_until_complete(
+        _gather(AsyncClient(request, session), calls, timeout, deadline))
+
+
+async def _gather(client, calls, timeout, deadline):
+    if deadline is not None:
+        remaining = max(0, deadline - time.time())
+        timeout = remaining if timeout is None else min(timeout, remaining)
+
+    tasks = [asyncio.ensure_future(VARIANTS[func](client, *args))
+             for func, args in calls]
+    pending = set()
+    if tasks:
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    # The cancelled calls give their connections back
+    await asyncio.gather(*pending, return_exceptions=True)
+    await client.cancel()
+
+    results = [None] * len(calls)
+    errors = {}
+    for i, task in enumerate(tasks):
+        if task in pending:
+            errors[i] = futures.TimeoutError()
+        elif task.exception() is not None:
+            errors[i] = task.exception()
+        else:
+            results[i] = task.result()
+
+    return results, errors
@@ -0,0 +1,440 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import json
+import socket
+import threading
+import time
+import unittest
+
+from concurrent import futures
+from django.test.utils import override_settings
+from horizon.test import helpers as test
+from iotronicclient import exc as iotronic_exc
+from keystoneauth1 import exceptions as ks_exc
+
+from openstack_dashboard.api import iotronic
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+try:
+    import asyncio
+
+    from aiohttp import web
+
+    from openstack_dashboard.api import iotronic_async
+except (ImportError, SyntaxError):
+    # Python 2, or no aiohttp
+    web = None
+
+
+class _User(object):
+    def __init__(self):
+        self.id = 'user'
+        self.project_id = 'project'
+        self.token = type('Token', (), {'id': 'token'})()
+        self.roles = []
+
+
+class _Request(object):
+    def __init__(self):
+        self.user = _User()
+
+
+class BreakerTests(test.TestCase):
+    # Unit tests for the circuit breaker of the IoTronic endpoints.
+    def setUp(self):
+        super(BreakerTests, self).setUp()
+        self.breaker = iotronic._Breaker('http://iotronic:8812')
+
+    def _fail(self, method):
+        raise ks_exc.ConnectFailure('Unable to reach IoTronic')
+
+    def _slow(self, method):
+        time.sleep(0.02)
+        return method
+
+    @override_settings(IOTRONIC_UI_CIRCUIT_BREAKER={'failures': 2})
+    def test_opens_after_failures(self):
+        for i in range(2):
+            self.assertRaises(ks_exc.ConnectFailure, self.breaker.call,
+                              self._fail, 'GET')
+        loader = mock.Mock()
+
+        self.assertEqual('open', self.breaker.state())
+        self.assertRaises(iotronic.CircuitOpen, self.breaker.call, loader,
+                          'GET')
+        self.assertFalse(loader.called)
+
+    @override_settings(IOTRONIC_UI_CIRCUIT_BREAKER={'failures': 1})
+    def test_answers_are_no_failures(self):
+        def get(method):
+            raise iotronic_exc.NotFound('Board not found')
+
+        self.assertRaises(iotronic_exc.NotFound, self.breaker.call, get,
+                          'GET')
+        self.assertEqual('closed', self.breaker.state())
+
+    @override_settings(IOTRONIC_UI_CIRCUIT_BREAKER={'failures': 1,
+                                                    'slow_call': 0.01})
+    def test_only_slow_reads_are_failures(self):
+        self.breaker.call(self._slow, 'POST')
+        self.assertEqual('closed', self.breaker.state())
+
+        self.breaker.call(self._slow, 'GET')
+        self.assertEqual('open', self.breaker.state())
+
+    @override_settings(IOTRONIC_UI_CIRCUIT_BREAKER={'failures': 1,
+                                                    'reset_timeout': 0.05})
+    def test_probe_closes_or_opens_again(self):
+        self.assertRaises(ks_exc.ConnectFailure, self.breaker.call,
+                          self._fail, 'GET')
+        time.sleep(0.06)
+        self.assertEqual('half-open', self.breaker.state())
+        self.assertRaises(ks_exc.ConnectFailure, self.breaker.call,
+                          self._fail, 'GET')
+        self.assertEqual('open', self.breaker.state())
+
+        time.sleep(0.06)
+        self.assertEqual('GET', self.breaker.call(lambda method: method,
+                                                  'GET'))
+        self.assertEqual('closed', self.breaker.state())
+
+
+class SingleFlightTests(test.TestCase):
+    # Unit tests for the backend calls shared by concurrent callers.
+    def _lead(self, loader):
+        # Runs loader() as the first caller, until release is set
+        self.release = threading.Event()
+        self.calls = []
+
+        def load():
+            self.calls.append(1)
+            self.release.wait()
+            return loader()
+
+        thread = threading.Thread(target=self._call, args=(load,))
+        thread.start()
+        self.addCleanup(thread.join)
+        while not self.calls:
+            time.sleep(0.01)
+
+    def _call(self, loader):
+        try:
+            iotronic._single_flight('test', 'key', loader)
+        except Exception:
+            pass
+
+    def _release(self, delay):
+        timer = threading.Timer(delay, self.release.set)
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+    def test_callers_share_the_call(self):
+        self._lead(lambda: 'boards')
+        self._release(0.05)
+
+        self.assertEqual('boards', iotronic._single_flight(
+            'test', 'key', lambda: 'again'))
+        self.assertEqual(1, len(self.calls))
+
+    def test_callers_share_the_error(self):
+        def fail():
+            raise iotronic_exc.NotFound('Board not found')
+
+        self._lead(fail)
+        self._release(0.05)
+
+        self.assertRaises(iotronic_exc.NotFound, iotronic._single_flight,
+                          'test', 'key', lambda: 'again')
+
+    def test_callers_wait_until_their_deadline(self):
+        self._lead(lambda: 'boards')
+        self.addCleanup(self.release.set)
+        deadline = iotronic._Deadline()
+        deadline.at = time.time() + 0.05
+
+        self.assertRaises(iotronic.DeadlineExceeded, iotronic._single_flight,
+                          'test', 'key', lambda: 'again', deadline)
+
+
+@mock.patch.object(iotronic, 'iotronicclient', mock.Mock())
+class CallConcurrentlyTests(test.TestCase):
+    # Unit tests for the IoTronic calls run on the worker pool.
+    def setUp(self):
+        super(CallConcurrentlyTests, self).setUp()
+        self.request = _Request()
+
+    def _get(self, request, delay, result):
+        time.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def test_results_and_errors_by_index(self):
+        error = iotronic_exc.NotFound('Board not found')
+        results, errors = iotronic.call_concurrently(
+            self.request, [(self._get, (0, 'b1')), (self._get, (0, error)),
+                           (self._get, (0, 'b3'))])
+
+        self.assertEqual(['b1', None, 'b3'], results)
+        self.assertEqual({1: error}, errors)
+
+    def test_calls_run_at_once(self):
+        started = time.time()
+        results, errors = iotronic.call_concurrently(
+            self.request, [(self._get, (0.2, i)) for i in range(4)])
+
+        self.assertLess(time.time() - started, 0.6)
+        self.assertEqual([0, 1, 2, 3], results)
+
+    def test_slow_calls_time_out(self):
+        started = time.time()
+        results, errors = iotronic.call_concurrently(
+            self.request, [(self._get, (0, 'b1')), (self._get, (1, 'b2'))],
+            timeout=0.1)
+
+        self.assertLess(time.time() - started, 0.8)
+        self.assertEqual(['b1', None], results)
+        self.assertIsInstance(errors[1], futures.TimeoutError)
+
+    def test_wait_all_waits_for_slow_calls(self):
+        results, errors = iotronic.call_concurrently(
+            self.request, [(self._get, (0.3, 'b1'))], timeout=0.1,
+            wait_all=True)
+
+        self.assertEqual(['b1'], results)
+
+    def test_calls_from_a_worker_run_inline(self):
+        def nested(request):
+            return iotronic.call_concurrently(
+                request, [(self._get, (0, 'b1'))])[0]
+
+        with mock.patch.object(iotronic, '_call_inline',
+                               wraps=iotronic._call_inline) as inline:
+            results, errors = iotronic.call_concurrently(
+                self.request, [(nested, ())], timeout=1)
+
+        self.assertEqual([['b1']], results)
+        self.assertEqual(1, inline.call_count)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class DjangoCacheTests(test.TestCase):
+    # Unit tests for the cache shared by the Horizon processes.
+    def test_values_are_kept_by_project(self):
+        cache = iotronic.DjangoCache('test_project', 10)
+        cache.set(('p1', 'board_list'), ('list', [1, 2]), 60)
+
+        self.assertEqual(('list', [1, 2]), cache.get(('p1', 'board_list')))
+        self.assertIsNone(cache.get(('p2', 'board_list')))
+
+    def test_invalidate_changes_the_generation(self):
+        cache = iotronic.DjangoCache('test_invalidate', 10)
+        cache.set(('p1', 'board_list'), 'boards', 60)
+        generation = cache.generation()
+        cache.invalidate()
+
+        self.assertNotEqual(generation, cache.generation())
+        self.assertIsNone(cache.get(('p1', 'board_list')))
+
+    def test_invalidate_without_generation(self):
+        cache = iotronic.DjangoCache('test_evicted', 10)
+        cache.set(('p1', 'board_list'), 'boards', 60)
+        cache._cache.delete(cache._generation_key)
+        cache.invalidate()
+
+        self.assertIsNone(cache.get(('p1', 'board_list')))
+
+    def test_lock_is_given_back(self):
+        cache = iotronic.DjangoCache('test_lock', 10)
+        with cache.lock(('p1', 'board_list')):
+            self.assertFalse(cache._cache.add(
+                cache._key(('p1', 'board_list')) + ':lock', 1, 60))
+
+        self.assertTrue(cache._cache.add(
+            cache._key(('p1', 'board_list')) + ':lock', 1, 60))
+
+
+class FakeIotronic(object):
+    """IoTronic API served by aiohttp from a thread of the test."""
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.calls = []
+        self.running = 0
+        self.most_running = 0
+        self.boards = {'b%d' % i: {'uuid': 'b%d' % i, 'name': 'board%d' % i}
+                       for i in range(5)}
+        self.services = {'s1': {'uuid': 's1', 'name': 'ssh', 'port': 22,
+                                'protocol': 'TCP'}}
+        self.failing = False
+
+    def _app(self):
+        app = web.Application()
+        app.router.add_route('*', '/{path:.*}', self._handle)
+        return app
+
+    async def _handle(self, request):
+        self.calls.append((request.method, request.path))
+        self.running += 1
+        self.most_running = max(self.most_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failing:
+                return self._error(500, 'Internal Server Error')
+            # The client asks for /v1/boards/?fields=... as well
+            path = [part for part in request.path.split('/')[2:] if part]
+            return self._answer(request.method, path, await request.text())
+        finally:
+            self.running -= 1
+
+    def _answer(self, method, path, body):
+        if method == 'POST' and path[-1] == 'action':
+            return web.json_response({'action': json.loads(body)['action']})
+        if path == ['boards']:
+            return web.json_response(
+                {'boards': list(self.boards.values())})
+        if path == ['services']:
+            return web.json_response(
+                {'services': list(self.services.values())})
+        if path[0] == 'boards' and path[1] not in self.boards:
+            return self._error(404, 'Board %s not found' % path[1])
+        if len(path) == 2:
+            return web.json_response(self.boards[path[1]])
+        if path[2] == 'services':
+            return web.json_response(
+                {'exposed': [{'service': 's1', 'public_port': 50022}]})
+        return self._error(404, 'Not found')
+
+    def _error(self, status, message):
+        error = json.dumps({'faultstring': message})
+        return web.json_response({'error_message': error}, status=status)
+
+    def start(self):
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        self.endpoint = 'http://127.0.0.1:%d/v1' % sock.getsockname()[1]
+
+        self._loop = asyncio.new_event_loop()
+        self._runner = web.AppRunner(self._app())
+        self._loop.run_until_complete(self._runner.setup())
+        self._loop.run_until_complete(
+            web.SockSite(self._runner, sock).start())
+        self._thread = threading.Thread(target=self._loop.run_forever)
+        self._thread.start()
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+
+@unittest.skipIf(web is None, 'Needs Python 3 and aiohttp')
+class AsyncLayerTests(test.TestCase):
+    # Unit tests for the asyncio variant of the IoTronic API.
+    def setUp(self):
+        super(AsyncLayerTests, self).setUp()
+        self.iotronic = FakeIotronic()
+        self.iotronic.start()
+        self.addCleanup(self.iotronic.stop)
+
+        endpoint = mock.patch.object(iotronic, '_endpoint',
+                                     return_value=self.iotronic.endpoint)
+        endpoint.start()
+        self.addCleanup(endpoint.stop)
+        self.request = _Request()
+
+    def test_runs_calls_at_once(self):
+        self.iotronic.delay = 0.3
+        started = time.time()
+        results, errors = iotronic_async.gather(
+            self.request, [(iotronic.board_get, ('b%d' % i, iotronic.NAME))
+                           for i in range(5)])
+
+        self.assertLess(time.time() - started, 1)
+        self.assertEqual(5, self.iotronic.most_running)
+        self.assertEqual({}, errors)
+        self.assertEqual(['board%d' % i for i in range(5)],
+                         [board.name for board in results])
+
+    def test_results_as_the_blocking_api(self):
+        results, errors = iotronic_async.gather(
+            self.request, [(iotronic.services_on_board, ('b1', True)),
+                           (iotronic.board_list, (None, None, None,
+                                                  iotronic.NAME))])
+
+        self.assertEqual({}, errors)
+        self.assertEqual([{'uuid': 's1', 'name': 'ssh',
+                           'public_port': 50022, 'port': 22,
+                           'protocol': 'TCP'}], results[0])
+        self.assertEqual(5, len(results[1]))
+        # The board services, the service catalog and the boards
+        self.assertEqual(3, len(self.iotronic.calls))
+
+    def test_errors_as_the_blocking_api(self):
+        results, errors = iotronic_async.gather(
+            self.request, [(iotronic.board_get, ('b1', iotronic.NAME)),
+                           (iotronic.board_get, ('b9', iotronic.NAME))])
+
+        self.assertEqual('board1', results[0].name)
+        self.assertIsInstance(errors[1], iotronic_exc.NotFound)
+
+    def test_calls_past_the_deadline_time_out(self):
+        self.iotronic.delay = 1
+        started = time.time()
+        results, errors = iotronic_async.gather(
+            self.request, [(iotronic.board_get, ('b1', iotronic.NAME))],
+            deadline=time.time() + 0.2)
+
+        self.assertLess(time.time() - started, 0.8)
+        self.assertIsInstance(errors[0], futures.TimeoutError)
+
+    def test_actions_drop_the_board_details(self):
+        with mock.patch.object(iotronic, '_forget_board') as forget:
+            results, errors = iotronic_async.gather(
+                self.request, [(iotronic.service_action,
+                                ('b1', 's1', 'ServiceEnable'))])
+
+        self.assertEqual({}, errors)
+        forget.assert_called_once_with('b1')
+        self.assertIn(('POST', '/v1/boards/b1/services/s1/action'),
+                      self.iotronic.calls)
+
+    @override_settings(IOTRONIC_UI_CIRCUIT_BREAKER={'failures': 2})
+    def test_failing_endpoint_opens_the_breaker(self):
+        # Not got by the other tests: no last known board to show
+        self.iotronic.failing = True
+        for i in range(2):
+            results, errors = iotronic_async.gather(
+                self.request, [(iotronic.board_get, ('b7', iotronic.NAME))])
+            self.assertIsInstance(errors[0], iotronic_exc.HttpServerError)
+
+        results, errors = iotronic_async.gather(
+            self.request, [(iotronic.board_get, ('b7', iotronic.NAME))])
+
+        self.assertIsInstance(errors[0], iotronic.CircuitOpen)
+        self.assertEqual(2, len(self.iotronic.calls))
+
+    @override_settings(IOTRONIC_UI_ASYNC=True)
+    def test_call_concurrently_uses_the_layer(self):
+        with mock.patch.object(iotronic, '_call_on_pool') as pool:
+            results, errors = iotronic.call_concurrently(
+                self.request, [(iotronic.board_get, ('b2', iotronic.NAME))])
+
+        self.assertFalse(pool.called)
+        self.assertEqual('board2', results[0].name)
@@ -1 +1,3 @@
 __version__ = '0.0.1'
+
+default_app_config = 'iotronic_ui.iot.apps.IotConfig'
@@ -0,0 +1,47 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import sys
+
+from django.apps import AppConfig
+from django.conf import settings
+
+
+def _serving(args):
+    return args[:1] == ['runserver'] and (
+        os.environ.get('RUN_MAIN') == 'true' or '--noreload' in args)
+
+
+class IotConfig(AppConfig):
+    name = 'iotronic_ui.iot'
+
+    def ready(self):
+        # Management commands (collectstatic, compress, ...) must not wait
+        # for or hit IoTronic, but for runserver in the process serving the
+        # requests, the child of its autoreloader
+        if (os.path.basename(sys.argv[0]) == 'manage.py' and
+                not _serving(sys.argv[1:])):
+            return
+
+        if getattr(settings, 'IOTRONIC_UI_WARMUP_ON_START', False):
+            from iotronic_ui.iot import warmup
+            warmup.warm_up_in_background()
+
+        if getattr(settings, 'IOTRONIC_UI_EVENTS', None):
+            from iotronic_ui.iot import events
+            events.start_listener()
+
+        interval = getattr(settings, 'IOTRONIC_UI_STATS_INTERVAL', 600)
+        if interval:
+            from iotronic_ui.iot import stats
+            stats.start_logger(interval)
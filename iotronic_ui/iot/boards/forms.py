@@ -21,6 +21,8 @@ from horizon import messages
 from openstack_dashboard.api import iotronic
 from openstack_dashboard import policy
 
+from iotronic_ui.iot import bulk
+
 LOG = logging.getLogger(__name__)
 
 
@@ -104,13 +106,10 @@ class UpdateBoardForm(forms.SelfHandlingForm):
         super(UpdateBoardForm, self).__init__(*args, **kwargs)
 
         # Populate fleets
-        fleets = iotronic.fleet_list(self.request, None)
-        fleets.sort(key=lambda b: b.name)
-
         fleet_list = []
         fleet_list.append((None, _("-")))
-        for fleet in fleets:
-            fleet_list.append((fleet.uuid, _(fleet.name)))
+        for uuid, name in iotronic.fleet_choices(self.request):
+            fleet_list.append((uuid, _(name)))
 
         # LOG.debug("FLEETS: %s", fleet_list)
         self.fields["fleet_list"].choices = fleet_list
@@ -200,24 +199,12 @@ class EnableServiceForm(forms.SelfHandlingForm):
 
     def handle(self, request, data):
 
-        counter = 0
-        for service in data["service_list"]:
-            try:
-                action = iotronic.service_action(request, data["uuid"],
-                                                 service, "ServiceEnable")
-
-                # message_text = "Service(s) enabled successfully."
-                message_text = action
-                messages.success(request, _(message_text))
+        actions = [(iotronic.service_action,
+                    (data["uuid"], service, "ServiceEnable"),
+                    None, "Unable to enable service.")
+                   for service in data["service_list"]]
 
-                if counter != len(data["service_list"]) - 1:
-                    counter += 1
-                else:
-                    return True
-
-            except Exception:
-                message_text = "Unable to enable service."
-                exceptions.handle(request, _(message_text))
+        return bulk.run_actions(request, actions)
 
 
 class DisableServiceForm(forms.SelfHandlingForm):
@@ -243,24 +230,12 @@ class DisableServiceForm(forms.SelfHandlingForm):
 
     def handle(self, request, data):
 
-        counter = 0
-        for service in data["service_list"]:
-            try:
-                action = iotronic.service_action(request, data["uuid"],
-                                                 service, "ServiceDisable")
-
-                # message_text = "Service(s) disabled successfully."
-                message_text = action
-                messages.success(request, _(message_text))
+        actions = [(iotronic.service_action,
+                    (data["uuid"], service, "ServiceDisable"),
+                    None, "Unable to disable service.")
+                   for service in data["service_list"]]
 
-                if counter != len(data["service_list"]) - 1:
-                    counter += 1
-                else:
-                    return True
-
-            except Exception:
-                message_text = "Unable to disable service."
-                exceptions.handle(request, _(message_text))
+        return bulk.run_actions(request, actions)
 
 
 class AttachPortForm(forms.SelfHandlingForm):
@@ -334,26 +309,16 @@ class DetachPortForm(forms.SelfHandlingForm):
     def handle(self, request, data):
         # LOG.debug("DATA: %s %s", data, len(data["port_list"]))
 
-        counter = 0
-
+        actions = []
         for port in data["port_list"]:
-            try:
-                iotronic.detach_port(request, data["uuid"], port)
-
-                message_text = "Detach port " + str(port) + " from board " + \
-                               str(data["name"]) + " completed successfully"
-                messages.success(request, _(message_text))
-
-                if counter != len(data["port_list"]) - 1:
-                    counter += 1
-                else:
-                    return True
+            success = "Detach port " + str(port) + " from board " + \
+                      str(data["name"]) + " completed successfully"
+            failure = "Unable to detach port " + str(port) + \
+                      " from board " + str(data["name"])
+            actions.append((iotronic.detach_port, (data["uuid"], port),
+                            success, failure))
 
-            except Exception:
-                message_text = "Unable to detach port " + str(port) + \
-                               " from board " + str(data["name"])
-
-                exceptions.handle(request, _(message_text))
+        return bulk.run_actions(request, actions)
 
 
 class EnableWebServiceForm(forms.SelfHandlingForm):
@@ -438,27 +403,17 @@ class RemovePluginsForm(forms.SelfHandlingForm):
 
     def handle(self, request, data):
 
-        counter = 0
-
+        actions = []
         for plugin in data["plugin_list"]:
             for key, value in self.fields["plugin_list"].choices:
                 if key == plugin:
-
-                    try:
-                        iotronic.plugin_remove(request, data["uuid"], key)
-
-                        message_text = "Plugin " + str(value) + \
-                                       " removed successfully."
-                        messages.success(request, _(message_text))
-
-                        if counter != len(data["plugin_list"]) - 1:
-                            counter += 1
-                        else:
-                            return True
-
-                    except Exception:
-                        message_text = "Unable to remove plugin " \
-                                       + str(value) + "."
-                        exceptions.handle(request, _(message_text))
-
+                    success = "Plugin " + str(value) + \
+                              " removed successfully."
+                    failure = "Unable to remove plugin " \
+                              + str(value) + "."
+                    actions.append((iotronic.plugin_remove,
+                                    (data["uuid"], key),
+                                    success, failure))
                     break
+
+        return bulk.run_actions(request, actions)
@@ -151,21 +151,14 @@ class DeleteBoardsAction(tables.DeleteAction):
 
 
 class BoardFilterAction(tables.FilterAction):
-
-    # If uncommented it will appear the select menu list of fields
-    # and filter button
-    """
+    # Filtered by IndexView, from the board inventory mirror if any
     filter_type = "server"
-    filter_choices = (("name", _("Board Name ="), True),
+    filter_choices = (("name", _("Board Name"), True),
                       ("type", _("Type ="), True),
-                      ("status", _("Status ="), True))
-    """
-
-    def filter(self, table, boards, filter_string):
-        """Naive case-insensitive search."""
-        q = filter_string.lower()
-        return [board for board in boards
-                if q in board.name.lower()]
+                      ("status", _("Status ="), True),
+                      ("fleet", _("Fleet Name ="), True),
+                      ("lr_version", _("LR version ="), True),
+                      ("owner", _("Owner ID ="), True))
 
 
 def show_services(board_info):
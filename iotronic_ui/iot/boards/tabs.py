@@ -38,6 +38,7 @@ class OverviewTab(tabs.Tab):
         services = self.tab_group.kwargs['board']._info['services']
         webservices = self.tab_group.kwargs['board']._info['webservices']
         plugins = self.tab_group.kwargs['board']._info['plugins']
+        stale = self.tab_group.kwargs['board']._info.get('stale', [])
 
         return {"board": self.tab_group.kwargs['board'],
                 "coordinates": coordinates,
@@ -45,6 +46,7 @@ class OverviewTab(tabs.Tab):
                 "webservices": webservices,
                 "ports": ports,
                 "plugins": plugins,
+                "stale": stale,
                 "is_superuser": request.user.is_superuser}
 
 
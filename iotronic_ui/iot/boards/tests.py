@@ -10,10 +10,139 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import pickle
+
 from horizon.test import helpers as test
+from iotronicclient import exc as iotronic_exc
+from iotronicclient.v1 import board as iotronic_board
+
+from openstack_dashboard.api import iotronic
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
 
 
 class BoardsTests(test.TestCase):
     # Unit tests for boards.
     def test_me(self):
         self.assertTrue(1 + 1 == 2)
+
+
+def _board(uuid, name, **info):
+    return iotronic_board.Board(None, dict(info, uuid=uuid, name=name),
+                                loaded=True)
+
+
+def _fan_out(request, func, args_list):
+    results, errors = [], {}
+    for i, args in enumerate(args_list):
+        try:
+            results.append(func(request, *args))
+        except Exception as e:
+            results.append(None)
+            errors[i] = e
+
+    return results, errors
+
+
+class SizedLRUTests(test.TestCase):
+    # Unit tests for the size bounded cache of the board details.
+    def setUp(self):
+        super(SizedLRUTests, self).setUp()
+        self.lru = iotronic._SizedLRU()
+        self.size = len(pickle.dumps('x' * 100, pickle.HIGHEST_PROTOCOL))
+
+    def test_evicts_the_least_recently_used(self):
+        for key in ('b1', 'b2'):
+            self.lru.set(key, 'x' * 100, 60, 2 * self.size)
+        self.lru.get('b1')
+        self.lru.set('b3', 'x' * 100, 60, 2 * self.size)
+
+        self.assertEqual('x' * 100, self.lru.get('b1'))
+        self.assertIsNone(self.lru.get('b2'))
+        self.assertEqual(2 * self.size, self.lru.size())
+
+    def test_skips_values_too_big(self):
+        self.lru.set('b1', 'x' * 100, 60, self.size - 1)
+
+        self.assertIsNone(self.lru.get('b1'))
+        self.assertEqual(0, self.lru.size())
+
+    def test_expired_values_are_dropped(self):
+        self.lru.set('b1', 'x' * 100, -1, self.size)
+
+        self.assertIsNone(self.lru.get('b1'))
+        self.assertEqual(0, self.lru.size())
+
+    def test_discard_if(self):
+        for key in (('p1', 'b1'), ('p1', 'b2'), ('p2', 'b1')):
+            self.lru.set(key, 'x' * 100, 60, 3 * self.size)
+        self.lru.discard_if(lambda key: key[1] == 'b1')
+
+        self.assertEqual('x' * 100, self.lru.get(('p1', 'b2')))
+        self.assertEqual(self.size, self.lru.size())
+
+
+@mock.patch.object(iotronic, 'fan_out', _fan_out)
+class SyncInventoryTests(test.TestCase):
+    # Unit tests for the board inventory synced with IoTronic.
+    def setUp(self):
+        super(SyncInventoryTests, self).setUp()
+        boards = [_board('b1', 'alpha', services=[]),
+                  _board('b2', 'beta', services=[]),
+                  _board('b3', 'gamma', services=[])]
+        self.inventory = iotronic._Inventory(
+            iotronic._freeze(boards), {'b1': 't1', 'b2': 't1', 'b3': 't1'})
+        self.enrich = mock.Mock(side_effect=lambda request, boards: boards)
+
+    def _sync(self, versions, boards):
+        with mock.patch.object(iotronic, 'board_versions',
+                               return_value=versions), \
+                mock.patch.object(iotronic, '_board_get',
+                                  side_effect=boards) as get:
+            inventory = iotronic._sync_inventory(None, self.inventory,
+                                                 self.enrich)
+
+        return inventory, [call[0][1] for call in get.call_args_list]
+
+    def _names(self, inventory):
+        return [board.name for board in iotronic._thaw(inventory.boards)]
+
+    def test_gets_only_the_changed_boards(self):
+        inventory, got = self._sync(
+            {'b1': 't1', 'b2': 't2', 'b4': 't1'},
+            lambda request, board_id, fields: _board(board_id, board_id,
+                                                     services=[]))
+
+        self.assertEqual(['b2', 'b4'], sorted(got))
+        # b3 was deleted
+        self.assertEqual(['alpha', 'b2', 'b4'], self._names(inventory))
+        self.assertEqual({'b1': 't1', 'b2': 't2', 'b4': 't1'},
+                         inventory.versions)
+        self.assertEqual(self.inventory.enriched_at, inventory.enriched_at)
+
+    def test_enriches_the_incomplete_boards_again(self):
+        self.inventory.boards[1][0][2]['services'] = None
+        inventory, got = self._sync(
+            {'b1': 't1', 'b2': 't1', 'b3': 't1'},
+            lambda request, board_id, fields: _board(board_id, 'alpha',
+                                                     services=[]))
+
+        self.assertEqual(['b1'], got)
+        self.assertEqual([], iotronic._thaw(inventory.boards)[0].services)
+
+    def test_remembers_the_boards_deleted_after_listing(self):
+        def get(request, board_id, fields):
+            raise iotronic_exc.NotFound('Board %s not found' % board_id)
+
+        self.inventory, got = self._sync(
+            {'b1': 't1', 'b2': 't1', 'b3': 't1', 'b4': 't1'}, get)
+        self.assertEqual(['b4'], got)
+        self.assertEqual({'b4': 't1'}, self.inventory.tombstones)
+
+        inventory, got = self._sync(
+            {'b1': 't1', 'b2': 't1', 'b3': 't1', 'b4': 't1'}, get)
+        self.assertEqual([], got)
+        self.assertEqual(['alpha', 'beta', 'gamma'], self._names(inventory))
@@ -10,15 +10,17 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from collections import OrderedDict
 import logging
 
+from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon import forms
-# from horizon import messages
+from horizon import messages
 from horizon import tables
 from horizon import tabs
 from horizon.utils import memoized
@@ -27,6 +29,7 @@ from horizon.utils import memoized
 from openstack_dashboard import api
 from openstack_dashboard import policy
 
+from iotronic_ui.iot import degraded
 from iotronic_ui.iot.boards import forms as project_forms
 from iotronic_ui.iot.boards import tables as project_tables
 from iotronic_ui.iot.boards import tabs as project_tabs
@@ -35,73 +38,120 @@ from iotronic_ui.iot.boards import tabs as project_tabs
 LOG = logging.getLogger(__name__)
 
 
+def _enrich_boards(request, boards):
+    """Add their services and fleet name to the boards, sorted by name.
+
+    The services of a board that could not be retrieved are the last known
+    ones, flagged by services_stale, or None. Without the fleets, the fleet
+    names are None.
+    """
+    # Per-board lookups and the fleets are independent: get them
+    # concurrently and keep building the list even if some of them fail.
+    board_services, services_errors = api.iotronic.call_concurrently(
+        request, [(api.iotronic.services_on_board, (board.uuid, True))
+                  for board in boards] +
+        [(api.iotronic.fleet_directory, ())])
+    fleets = board_services.pop() or {}
+    services_errors.pop(len(boards), None)
+
+    for i, (board, services) in enumerate(zip(boards, board_services)):
+
+        # Late or failed lookups show the last known services, if any
+        services_stale = False
+        if i in services_errors:
+            services = api.iotronic.last_known(
+                request, api.iotronic.services_on_board, board.uuid, True)
+            services_stale = services is not None
+            if services_stale:
+                del services_errors[i]
+
+        # TO BE REMOVED
+        # We are filtering the services that starts with "webservice"
+        # ------------------------------------------------------------
+        if i not in services_errors:
+            services = [service for service in services
+                        if ((service["name"] != "webservice") and
+                            (service["name"] != "webservice_ssl"))]
+        # ------------------------------------------------------------
+
+        fleet = fleets.get(board.fleet)
+        fleet_name = fleet.name if fleet is not None else None
+
+        # board.__dict__.update(dict(services=board_services))
+        board._info.update(dict(services=services,
+                                services_stale=services_stale,
+                                fleet_name=fleet_name))
+        board.fleet_name = fleet_name
+
+    boards.sort(key=lambda b: b.name)
+    return boards
+
+
+def _load_boards(request):
+    """List the boards enriched with their services and fleet name."""
+    boards = api.iotronic.board_list(request, None, None,
+                                     fields=api.iotronic.SUMMARY)
+    return _enrich_boards(request, boards)
+
+
 class IndexView(tables.DataTableView):
     table_class = project_tables.BoardsTable
     template_name = 'iot/boards/index.html'
     page_title = _("Boards")
+    inventory_age = 0
 
     def get_data(self):
+        api.iotronic.set_deadline(self.request, getattr(
+            settings, 'IOTRONIC_UI_PAGE_DEADLINE', 20))
+
         boards = []
 
         # Admin
         if policy.check((("iot", "iot:list_all_boards"),), self.request):
-            try:
-                boards = api.iotronic.board_list(self.request, None, None)
-
-            except Exception:
-                exceptions.handle(self.request,
-                                  _('Unable to retrieve boards list.'))
+            error_message = _('Unable to retrieve boards list.')
 
         # Admin_iot_project
         elif policy.check((("iot", "iot:list_project_boards"),), self.request):
-            try:
-                boards = api.iotronic.board_list(self.request, None, None)
-
-            except Exception:
-                exceptions.handle(self.request,
-                                  _('Unable to retrieve user boards list.'))
+            error_message = _('Unable to retrieve user boards list.')
 
         # Other users
         else:
-            try:
-                boards = api.iotronic.board_list(self.request, None, None)
+            error_message = _('Unable to retrieve user boards list.')
 
-            except Exception:
-                exceptions.handle(self.request,
-                                  _('Unable to retrieve user boards list.'))
-
-        for board in boards:
-            board_services = api.iotronic.services_on_board(self.request,
-                                                            board.uuid,
-                                                            True)
-
-            # TO BE REMOVED
-            # We are filtering the services that starts with "webservice"
-            # ------------------------------------------------------------
-            filter_ws = []
-            for service in board_services:
-                if ((service["name"] != "webservice") and 
-                   (service["name"] != "webservice_ssl")):
-                    filter_ws.append(service)
-
-            board_services = filter_ws
-            # ------------------------------------------------------------
-
-            # board.__dict__.update(dict(services=board_services))
-            board._info.update(dict(services=board_services))
-
-            if board.fleet != None:            
-                fleet_info = api.iotronic.fleet_get(self.request,
-                                                    board.fleet,
-                                                    None)
-
-                board.fleet_name = fleet_info.name
+        filter_info = self.get_server_filter_info(self.request) or {}
+        field, value = filter_info.get('field'), filter_info.get('value')
+
+        try:
+            if field and value:
+                boards, self.inventory_age = api.iotronic.board_search(
+                    self.request, field, value, _load_boards,
+                    _enrich_boards)
             else:
-                board.fleet_name = None
+                boards, self.inventory_age = api.iotronic.board_inventory(
+                    self.request, _load_boards, _enrich_boards)
+
+        except Exception:
+            exceptions.handle(self.request, error_message)
+
+        if any(board._info["services"] is None for board in boards):
+            messages.warning(self.request,
+                             _('Unable to retrieve some board details.'))
+
+        degraded.warn(self.request)
 
-        boards.sort(key=lambda b: b.name)
         return boards
 
+    def get_context_data(self, **kwargs):
+        context = super(IndexView, self).get_context_data(**kwargs)
+        context["inventory_age"] = self.inventory_age
+
+        status_counts = api.iotronic.board_counts(self.request, "status")
+        if status_counts:
+            context["status_counts"] = sorted(
+                (status or "--", count)
+                for status, count in status_counts.items())
+        return context
+
 
 class CreateView(forms.ModalFormView):
     template_name = 'iot/boards/create.html'
@@ -172,7 +222,7 @@ class EnableServiceView(forms.ModalFormView):
         try:
             return api.iotronic.board_get(self.request,
                                           self.kwargs['board_id'],
-                                          None)
+                                          api.iotronic.NAME)
 
         except Exception:
             redirect = reverse("horizon:iot:boards:index")
@@ -190,18 +240,14 @@ class EnableServiceView(forms.ModalFormView):
         board = self.get_object()
 
         # Populate available services
-        cloud_services = api.iotronic.service_list(self.request, None)
+        cloud_services = api.iotronic.service_choices(self.request)
         board_services = api.iotronic.services_on_board(self.request,
                                                         board.uuid,
                                                         True)
-        cloud_services.sort(key=lambda b: b.name)
         service_list = []
         # LOG.debug('CLOUD SERVICES: %s', cloud_services)
 
-        for cloud_service in cloud_services:
-
-            uuid = cloud_service._info["uuid"]
-            name = cloud_service._info["name"]
+        for uuid, name in cloud_services:
 
             if len(board_services) == 0:
 
@@ -217,7 +263,7 @@ class EnableServiceView(forms.ModalFormView):
             else:
                 counter = 0
                 for board_service in board_services:
-                    if board_service["uuid"] == cloud_service._info["uuid"]:
+                    if board_service["uuid"] == uuid:
                         break
                     elif counter != len(board_services) - 1:
                         counter += 1
@@ -254,7 +300,7 @@ class DisableServiceView(forms.ModalFormView):
         try:
             return api.iotronic.board_get(self.request,
                                           self.kwargs['board_id'],
-                                          None)
+                                          api.iotronic.NAME)
 
         except Exception:
             redirect = reverse("horizon:iot:boards:index")
@@ -272,11 +318,10 @@ class DisableServiceView(forms.ModalFormView):
         board = self.get_object()
 
         # Populate available services
-        cloud_services = api.iotronic.service_list(self.request, None)
+        cloud_services = api.iotronic.service_choices(self.request)
         board_services = api.iotronic.services_on_board(self.request,
                                                         board.uuid,
                                                         True)
-        cloud_services.sort(key=lambda b: b.name)
         service_list = []
 
         # BEFORE filtering necessity
@@ -291,13 +336,12 @@ class DisableServiceView(forms.ModalFormView):
         # AFTER filtering necessity
         # We are filtering the services that starts with "webservice"
         # ------------------------------------------------------------
-        for cloud_service in cloud_services:
+        for uuid, name in cloud_services:
             for board_service in board_services:
-                if ((board_service["uuid"] == cloud_service._info["uuid"]) and
+                if ((board_service["uuid"] == uuid) and
                    ((board_service["name"] != "webservice") and
-                   (board_service["name"] != "webservice_ssl"))): 
-                    service_list.append((cloud_service._info["uuid"],
-                                        _(cloud_service._info["name"])))
+                   (board_service["name"] != "webservice_ssl"))):
+                    service_list.append((uuid, _(name)))
         # ------------------------------------------------------------
 
         return {'uuid': board.uuid,
@@ -321,7 +365,7 @@ class AttachPortView(forms.ModalFormView):
         try:
             return api.iotronic.board_get(self.request,
                                           self.kwargs['board_id'],
-                                          None)
+                                          api.iotronic.NAME)
         except Exception:
             redirect = reverse("horizon:iot:boards:index")
             exceptions.handle(self.request,
@@ -368,7 +412,7 @@ class DetachPortView(forms.ModalFormView):
         try:
             return api.iotronic.board_get(self.request,
                                           self.kwargs['board_id'],
-                                          None)
+                                          api.iotronic.NAME)
         except Exception:
             redirect = reverse("horizon:iot:boards:index")
             exceptions.handle(self.request,
@@ -385,26 +429,16 @@ class DetachPortView(forms.ModalFormView):
         board = self.get_object()
 
         ports = api.iotronic.port_list(self.request, board.uuid)
-
-        # TO BE REMOVED (change it once the port_list per board is
-        # completed and tested !
-        # ################################################################
-        # LOG.debug("PORTS: %s", ports)
-
         ports.sort(key=lambda b: b.name)
-        filtered_ports = []
-        for port in ports:
-            if port._info["board_uuid"] == board.uuid:
-                filtered_ports.append((port._info["uuid"],
-                                      _(port._info["ip"])))
 
-        ports = filtered_ports
-        # ################################################################
+        port_list = []
+        for port in ports:
+            port_list.append((port._info["uuid"], _(port._info["ip"])))
 
         # Populate board ports
         return {'uuid': board.uuid,
                 'name': board.name,
-                'ports': ports}
+                'ports': port_list}
 
 
 class EnableWebServiceView(forms.ModalFormView):
@@ -423,7 +457,7 @@ class EnableWebServiceView(forms.ModalFormView):
         try:
             return api.iotronic.board_get(self.request,
                                           self.kwargs['board_id'],
-                                          None)
+                                          api.iotronic.NAME)
 
         except Exception:
             redirect = reverse("horizon:iot:boards:index")
@@ -460,7 +494,7 @@ class DisableWebServiceView(forms.ModalFormView):
         try:
             return api.iotronic.board_get(self.request,
                                           self.kwargs['board_id'],
-                                          None)
+                                          api.iotronic.NAME)
 
         except Exception:
             redirect = reverse("horizon:iot:boards:index")
@@ -497,7 +531,7 @@ class RemovePluginsView(forms.ModalFormView):
         try:
             return api.iotronic.board_get(self.request,
                                           self.kwargs['board_id'],
-                                          None)
+                                          api.iotronic.NAME)
         except Exception:
             redirect = reverse("horizon:iot:boards:index")
             exceptions.handle(self.request,
@@ -550,54 +584,80 @@ class DetailView(tabs.TabView):
     @memoized.memoized_method
     def get_data(self):
 
-        board = []
-
         board_id = self.kwargs['board_id']
-        try:
-
-            board_ports = []
-
-            board = api.iotronic.board_get(self.request, board_id, None)
-
-            # FIX this problem with the new APIs
-            # (remove the "if" clause with a better approach)
-            # #################################################################
-            ports = api.iotronic.port_list(self.request, board_id)
-
-            for port in ports:
-                if port._info["board_uuid"] == board_id:
-                    board_ports.append(port._info)
-            board._info.update(dict(ports=board_ports))
-            # #################################################################
-
-            board_services = api.iotronic.services_on_board(self.request,
-                                                            board_id, True)
-            board._info.update(dict(services=board_services))
-
-            board_plugins = api.iotronic.plugins_on_board(self.request,
-                                                          board_id)
-            board._info.update(dict(plugins=board_plugins))
-
-            board_webservices = api.iotronic.webservices_on_board(self.request,
-                                                                  board_id)
-            board._info.update(dict(webservices=board_webservices))
 
-            # Adding fleet name
-            if board.fleet != None:
-                fleet_info = api.iotronic.fleet_get(self.request,
-                                                    board.fleet,
-                                                    None)
-
-                board.fleet_name = fleet_info.name
-            else:
-                board.fleet_name = None
-
-            # LOG.debug("BOARD: %s\n\n%s", board, board._info)
-
-        except Exception:
-            msg = ('Unable to retrieve board %s information') % {'name':
-                                                                 board.name}
-            exceptions.handle(self.request, msg, ignore=True)
+        board = api.iotronic.board_detail_get(self.request, board_id)
+        if board is not None:
+            return board
+
+        # The board and its resources are independent: fetch them all at
+        # once and render whatever arrived before the page deadline.
+        sources = OrderedDict([
+            ("board", (api.iotronic.board_get, (board_id, None))),
+            ("ports", (api.iotronic.port_list, (board_id,))),
+            ("services", (api.iotronic.services_on_board, (board_id, True))),
+            ("plugins", (api.iotronic.plugins_on_board, (board_id,))),
+            ("webservices", (api.iotronic.webservices_on_board, (board_id,))),
+        ])
+
+        api.iotronic.set_deadline(self.request, getattr(
+            settings, 'IOTRONIC_UI_BOARD_DETAIL_DEADLINE', 10))
+        results, errors = api.iotronic.call_concurrently(
+            self.request, list(sources.values()) +
+            [(api.iotronic.fleet_directory, ())])
+        fleets = results.pop()
+        data = OrderedDict(zip(sources.keys(), results))
+
+        # Fill the sections that did not arrive in time with their last
+        # known data
+        stale = []
+        for name, (func, args) in list(sources.items())[1:]:
+            if data[name] is None:
+                data[name] = api.iotronic.last_known(self.request, func,
+                                                     *args)
+                if data[name] is not None:
+                    stale.append(name)
+
+        board = data.pop("board")
+        if board is None:
+            try:
+                raise errors[0]
+            except Exception:
+                redirect = reverse("horizon:iot:boards:index")
+                exceptions.handle(self.request,
+                                  _('Unable to retrieve board information.'),
+                                  redirect=redirect)
+
+        if data["ports"] is not None:
+            data["ports"] = [port._info for port in data["ports"]]
+
+        missing = []
+        for name, value in data.items():
+            if value is None:
+                missing.append(name)
+                value = []
+            board._info.update({name: value})
+
+        if missing:
+            messages.warning(self.request,
+                             _('Unable to retrieve board %s.') %
+                             ", ".join(missing))
+
+        if stale:
+            messages.warning(self.request,
+                             _('Showing the last known board %s.') %
+                             ", ".join(stale))
+        board._info.update(dict(stale=stale))
+
+        # Adding fleet name, unknown without the fleets
+        fleet = (fleets or {}).get(board.fleet)
+        board.fleet_name = fleet.name if fleet is not None else None
+        board._info.update(dict(fleet_name=board.fleet_name))
+
+        if not missing and not stale and fleets is not None:
+            api.iotronic.board_detail_set(self.request, board_id, board)
+
+        # LOG.debug("BOARD: %s\n\n%s", board, board._info)
         return board
 
     def get_tabs(self, request, *args, **kwargs):
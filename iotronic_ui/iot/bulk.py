@@ -0,0 +1,47 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Run the actions of the bulk forms of the IoT dashboard concurrently."""
+
+from django.utils.translation import ugettext_lazy as _
+
+from horizon import exceptions
+from horizon import messages
+
+from openstack_dashboard.api import iotronic
+
+
+def run_actions(request, actions):
+    """Run every (func, args, success, failure) action of a form at once.
+
+    Each func is called as func(request, *args) on the IoTronic worker pool
+    and waited for however long it runs. The outcome of the actions is then
+    reported in their order: success is the message of a completed action,
+    or None to show the text it returned, failure the message of a failed
+    one.
+
+    Returns True if every action completed.
+    """
+    results, errors = iotronic.call_concurrently(
+        request, [(func, args) for func, args, _s, _f in actions],
+        wait_all=True)
+
+    for index, (func, args, success, failure) in enumerate(actions):
+        if index in errors:
+            try:
+                raise errors[index]
+            except Exception:
+                exceptions.handle(request, _(failure))
+        else:
+            messages.success(request, _(success or results[index]))
+
+    return bool(actions) and not errors
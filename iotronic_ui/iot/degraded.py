@@ -0,0 +1,28 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Tell the users of the IoT dashboard when a page shows stale data."""
+
+from django.utils.translation import ugettext_lazy as _
+
+from horizon import messages
+
+from openstack_dashboard.api import iotronic
+
+
+def warn(request):
+    """Warn if the request was shown the last known data of IoTronic, as
+    it was not responding.
+    """
+    if iotronic.degraded(request):
+        messages.warning(request, _('IoTronic is not responding: showing '
+                                    'the last known data.'))
@@ -0,0 +1,153 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Keep the IoT dashboard caches up to date with the IoTronic events.
+
+The listener joins the WAMP router of IoTronic, IOTRONIC_UI_EVENTS['url']
+and ['realm'], and subscribes to the topics of IOTRONIC_UI_EVENTS['topics']
+mapping them to the changed entity. Board events patch the board status
+when they carry one, the other events drop the cached data of their
+entity. While the router is unreachable the caches expire by their TTLs
+only. It needs autobahn, and can be tried against a local router such as
+crossbar publishing the same topics.
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+
+from openstack_dashboard import api
+
+try:
+    import asyncio
+    from autobahn.asyncio.component import Component
+    import txaio
+except ImportError:
+    Component = None
+
+
+LOG = logging.getLogger(__name__)
+
+_CONNECTED = threading.Event()
+
+TOPICS = {
+    'iotronic.board.connected': 'board',
+    'iotronic.board.disconnected': 'board',
+    'iotronic.board.updated': 'board',
+    'iotronic.fleet.updated': 'fleet',
+    'iotronic.plugin.updated': 'plugin',
+    'iotronic.port.updated': 'port',
+    'iotronic.service.updated': 'service',
+    'iotronic.webservice.updated': 'webservice',
+}
+
+# Board status implied by the topics without a status in their payload
+STATUSES = {
+    'iotronic.board.connected': 'online',
+    'iotronic.board.disconnected': 'offline',
+}
+
+
+def _config():
+    return getattr(settings, 'IOTRONIC_UI_EVENTS', {})
+
+
+def _board_id(args, kwargs):
+    for name in ('board_uuid', 'board', 'uuid'):
+        if kwargs.get(name):
+            return kwargs[name]
+
+    if args and isinstance(args[0], dict):
+        return _board_id((), args[0])
+    if args:
+        return args[0]
+
+    return None
+
+
+def handle_event(topic, *args, **kwargs):
+    """Apply an event of the IoTronic event stream to the caches."""
+    entity = dict(TOPICS, **_config().get('topics', {})).get(topic)
+    if entity is None:
+        return
+
+    board_id = _board_id(args, kwargs)
+    LOG.debug('IoTronic event %s on board %s', topic, board_id)
+
+    if entity == 'board' and board_id:
+        payload = args[0] if args and isinstance(args[0], dict) else kwargs
+        status = payload.get('status', STATUSES.get(topic))
+        api.iotronic.board_changed(board_id, status)
+    else:
+        api.iotronic.entity_changed(entity, board_id)
+
+
+def _subscribe(session, details):
+    LOG.info('Listening to the IoTronic events on %s', _config()['url'])
+    _CONNECTED.set()
+    api.iotronic.events_connected(True)
+
+    topics = dict(TOPICS, **_config().get('topics', {}))
+    for topic in topics:
+        session.subscribe(_handler(topic), topic)
+
+
+def _handler(topic):
+    def handler(*args, **kwargs):
+        try:
+            handle_event(topic, *args, **kwargs)
+        except Exception:
+            LOG.exception('Unable to handle the IoTronic event %s', topic)
+
+    return handler
+
+
+def _disconnected(*args, **kwargs):
+    if _CONNECTED.is_set():
+        _CONNECTED.clear()
+        LOG.warning('IoTronic event stream lost, caches fall back to TTLs')
+        api.iotronic.events_connected(False)
+
+
+def start_listener():
+    """Listen to the IoTronic events in a background thread.
+
+    Returns the thread, or None if autobahn is not installed.
+    """
+    if Component is None:
+        LOG.warning('autobahn is not installed: the IoT dashboard caches '
+                    'are refreshed by their TTLs only')
+        return None
+
+    config = _config()
+    component = Component(
+        transports=[{'url': config['url'],
+                     'max_retries': -1,
+                     'max_retry_delay': config.get('max_retry_delay', 30)}],
+        realm=config.get('realm', 's4t'))
+    component.on('join', _subscribe)
+    component.on('leave', _disconnected)
+    component.on('disconnect', _disconnected)
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        txaio.config.loop = loop
+        component.start(loop=loop)
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, name='iotronic-ui-events')
+    thread.daemon = True
+    thread.start()
+
+    return thread
@@ -12,13 +12,13 @@
 
 import logging
 
+from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon import forms
-# from horizon import messages
 from horizon import tables
 from horizon import tabs
 from horizon.utils import memoized
@@ -26,6 +26,7 @@ from horizon.utils import memoized
 from openstack_dashboard.api import iotronic
 from openstack_dashboard import policy
 
+from iotronic_ui.iot import degraded
 from iotronic_ui.iot.fleets import forms as project_forms
 from iotronic_ui.iot.fleets import tables as project_tables
 from iotronic_ui.iot.fleets import tabs as project_tabs
@@ -40,12 +41,16 @@ class IndexView(tables.DataTableView):
     page_title = _("Fleets")
 
     def get_data(self):
+        iotronic.set_deadline(self.request, getattr(
+            settings, 'IOTRONIC_UI_PAGE_DEADLINE', 20))
+
         fleets = []
 
         # Admin
         if policy.check((("iot", "iot:list_all_fleets"),), self.request):
             try:
-                fleets = iotronic.fleet_list(self.request, None)
+                fleets = iotronic.fleet_list(self.request, None,
+                                             fields=iotronic.SUMMARY)
 
             except Exception:
                 exceptions.handle(self.request,
@@ -55,7 +60,8 @@ class IndexView(tables.DataTableView):
         elif policy.check((("iot", "iot:list_project_fleets"),),
                           self.request):
             try:
-                fleets = iotronic.fleet_list(self.request, None)
+                fleets = iotronic.fleet_list(self.request, None,
+                                             fields=iotronic.SUMMARY)
 
             except Exception:
                 exceptions.handle(self.request,
@@ -64,12 +70,15 @@ class IndexView(tables.DataTableView):
         # Other users
         else:
             try:
-                fleets = iotronic.fleet_list(self.request, None)
+                fleets = iotronic.fleet_list(self.request, None,
+                                             fields=iotronic.SUMMARY)
 
             except Exception:
                 exceptions.handle(self.request,
                                   _('Unable to retrieve user fleets list.'))
 
+        degraded.warn(self.request)
+
         return fleets
 
 
@@ -99,7 +108,7 @@ class UpdateView(forms.ModalFormView):
         try:
             return iotronic.fleet_get(self.request,
                                         self.kwargs['fleet_id'],
-                                        None)
+                                        iotronic.SUMMARY)
         except Exception:
             redirect = reverse("horizon:iot:fleets:index")
             exceptions.handle(self.request,
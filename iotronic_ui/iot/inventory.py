@@ -0,0 +1,236 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Local SQLite mirror of the boards, fleets, services and plugins.
+
+The mirror is kept in the IOTRONIC_UI_INVENTORY_DB file, shared by the
+Horizon processes of a host and kept across their restarts. Its entries
+belong to a scope, the project and roles of the users that listed them,
+and every listing only writes the entries that changed.
+"""
+
+from contextlib import closing
+import json
+import re
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+
+
+BOARD_COLUMNS = ('name', 'status', 'type', 'fleet', 'lr_version', 'owner')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    scope TEXT NOT NULL,
+    uuid TEXT NOT NULL,
+    name TEXT,
+    status TEXT,
+    type TEXT,
+    fleet TEXT,
+    lr_version TEXT,
+    owner TEXT,
+    updated_at TEXT,
+    info TEXT NOT NULL,
+    PRIMARY KEY (scope, uuid)
+);
+CREATE INDEX IF NOT EXISTS boards_name ON boards (scope, name);
+CREATE INDEX IF NOT EXISTS boards_status ON boards (scope, status);
+CREATE INDEX IF NOT EXISTS boards_type ON boards (scope, type);
+CREATE INDEX IF NOT EXISTS boards_fleet ON boards (scope, fleet);
+CREATE INDEX IF NOT EXISTS boards_lr_version ON boards (scope, lr_version);
+CREATE INDEX IF NOT EXISTS boards_owner ON boards (scope, owner);
+
+CREATE TABLE IF NOT EXISTS resources (
+    kind TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    uuid TEXT NOT NULL,
+    name TEXT,
+    owner TEXT,
+    info TEXT NOT NULL,
+    PRIMARY KEY (kind, scope, uuid)
+);
+CREATE INDEX IF NOT EXISTS resources_name ON resources (kind, scope, name);
+CREATE INDEX IF NOT EXISTS resources_owner ON resources (kind, scope, owner);
+
+CREATE TABLE IF NOT EXISTS synced (
+    kind TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (kind, scope)
+);
+"""
+
+_CREATED = set()
+_CREATED_LOCK = threading.Lock()
+
+
+def enabled():
+    return bool(getattr(settings, 'IOTRONIC_UI_INVENTORY_DB', None))
+
+
+def _connect():
+    path = settings.IOTRONIC_UI_INVENTORY_DB
+    connection = sqlite3.connect(path, timeout=5)
+
+    with _CREATED_LOCK:
+        if path not in _CREATED:
+            # Let the readers of the other processes go on while writing
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(_SCHEMA)
+            _CREATED.add(path)
+
+    return connection
+
+
+def _scope(scope):
+    return json.dumps(scope)
+
+
+def _dump(info):
+    return json.dumps(info, sort_keys=True, default=str)
+
+
+def _synced(connection, kind, scope):
+    connection.execute('INSERT OR REPLACE INTO synced VALUES (?, ?, ?)',
+                       (kind, scope, time.time()))
+
+
+def synced_at(kind, scope):
+    """When the entries of kind were last written for scope, or None."""
+    with closing(_connect()) as connection:
+        row = connection.execute(
+            'SELECT synced_at FROM synced WHERE kind = ? AND scope = ?',
+            (kind, _scope(scope))).fetchone()
+
+    return row[0] if row else None
+
+
+def expire(kind):
+    """Mark the entries of kind as outdated for every scope."""
+    with closing(_connect()) as connection, connection:
+        connection.execute('DELETE FROM synced WHERE kind = ?', (kind,))
+
+
+def store_boards(scope, boards):
+    """Mirror the info dicts of all the boards of scope."""
+    scope = _scope(scope)
+    rows = dict((info["uuid"], _dump(info)) for info in boards)
+
+    with closing(_connect()) as connection, connection:
+        current = dict(connection.execute(
+            'SELECT uuid, info FROM boards WHERE scope = ?', (scope,)))
+
+        connection.executemany(
+            'DELETE FROM boards WHERE scope = ? AND uuid = ?',
+            [(scope, uuid) for uuid in set(current) - set(rows)])
+
+        changed = [info for info in boards
+                   if current.get(info["uuid"]) != rows[info["uuid"]]]
+        connection.executemany(
+            'INSERT OR REPLACE INTO boards VALUES '
+            '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(scope, info["uuid"]) +
+             tuple(info.get(column) for column in BOARD_COLUMNS) +
+             (info.get("updated_at"), rows[info["uuid"]])
+             for info in changed])
+
+        _synced(connection, 'board', scope)
+
+
+def store_resources(kind, scope, resources, complete=True):
+    """Mirror the info dicts of the fleets, services or plugins of scope.
+
+    Unless complete, the entries missing from resources are kept.
+    """
+    scope = _scope(scope)
+    rows = dict((info["uuid"], _dump(info)) for info in resources)
+
+    with closing(_connect()) as connection, connection:
+        current = dict(connection.execute(
+            'SELECT uuid, info FROM resources WHERE kind = ? AND scope = ?',
+            (kind, scope)))
+
+        if complete:
+            connection.executemany(
+                'DELETE FROM resources WHERE kind = ? AND scope = ? '
+                'AND uuid = ?',
+                [(kind, scope, uuid) for uuid in set(current) - set(rows)])
+
+        connection.executemany(
+            'INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?, ?, ?)',
+            [(kind, scope, info["uuid"], info.get("name"), info.get("owner"),
+              rows[info["uuid"]])
+             for info in resources
+             if current.get(info["uuid"]) != rows[info["uuid"]]])
+
+        if complete:
+            _synced(connection, kind, scope)
+
+
+def resource_choices(kind, scope):
+    """(uuid, name) of the fleets, services or plugins of scope, sorted by
+    name.
+    """
+    with closing(_connect()) as connection:
+        return list(connection.execute(
+            'SELECT uuid, name FROM resources WHERE kind = ? AND scope = ? '
+            'ORDER BY name', (kind, _scope(scope))))
+
+
+def boards(scope, name_contains=None, **filters):
+    """Info dicts of the boards of scope, sorted by name.
+
+    Only the boards whose name contains name_contains, case-insensitively,
+    and whose columns have the given values, or one of the given lists of
+    values, are returned.
+    """
+    query = 'SELECT info FROM boards WHERE scope = ?'
+    params = [_scope(scope)]
+    if name_contains:
+        query += " AND name LIKE ? ESCAPE '\\'"
+        params.append('%%%s%%' % re.sub(r'([%_\\])', r'\\\1',
+                                        name_contains))
+    for column, value in sorted(filters.items()):
+        if column not in BOARD_COLUMNS:
+            raise ValueError(column)
+        values = value if isinstance(value, (list, tuple)) else [value]
+        query += ' AND %s IN (%s)' % (column, ', '.join('?' * len(values)))
+        params.extend(values)
+
+    with closing(_connect()) as connection:
+        rows = connection.execute(query + ' ORDER BY name', params)
+        return [json.loads(info) for info, in rows]
+
+
+def board_counts(scope, column):
+    """Map the values of a board column to the number of boards of scope."""
+    if column not in BOARD_COLUMNS:
+        raise ValueError(column)
+
+    with closing(_connect()) as connection:
+        return dict(connection.execute(
+            'SELECT %s, COUNT(*) FROM boards WHERE scope = ? GROUP BY %s' %
+            (column, column), (_scope(scope),)))
+
+
+def board_choices(scope, status=None):
+    """(uuid, name) of the boards of scope, with status if given."""
+    query = 'SELECT uuid, name FROM boards WHERE scope = ?'
+    params = [_scope(scope)]
+    if status is not None:
+        query += ' AND status = ?'
+        params.append(status)
+
+    with closing(_connect()) as connection:
+        return list(connection.execute(query + ' ORDER BY name', params))
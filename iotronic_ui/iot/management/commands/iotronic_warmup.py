@@ -0,0 +1,56 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from iotronic_ui.iot import warmup
+
+
+class Command(BaseCommand):
+    help = ("Prefetch the IoTronic data shown first by the IoT dashboard "
+            "for the given, or the IOTRONIC_UI_WARMUP_PROJECTS, projects.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('projects', nargs='*', metavar='PROJECT_ID',
+                            help='Projects to warm up.')
+
+    def handle(self, *args, **options):
+        # This process ends right after: without a shared cache or board
+        # mirror nothing it fetches would reach the Horizon processes
+        shared_cache = getattr(settings, 'IOTRONIC_UI_CACHE_BACKEND', None)
+        shared_boards = getattr(settings, 'IOTRONIC_UI_INVENTORY_DB', None)
+        if not shared_cache and not shared_boards:
+            raise CommandError('Nothing to warm up: set '
+                               'IOTRONIC_UI_CACHE_BACKEND or '
+                               'IOTRONIC_UI_INVENTORY_DB.')
+        if not shared_cache:
+            self.stderr.write('IOTRONIC_UI_CACHE_BACKEND is not set: only '
+                              'the mirrored boards, fleets and services are '
+                              'warmed up.')
+        if not shared_boards:
+            self.stderr.write('IOTRONIC_UI_INVENTORY_DB is not set: the '
+                              'board inventories are not warmed up.')
+
+        results = warmup.warm_up(options['projects'] or None)
+
+        failed = [project for project, error in results.items() if error]
+        for project, error in sorted(results.items()):
+            if error:
+                self.stderr.write('%s: %s' % (project, error))
+            else:
+                self.stdout.write('%s: warmed up' % project)
+
+        if failed:
+            raise CommandError('Unable to warm up %d of %d projects.' %
+                               (len(failed), len(results)))
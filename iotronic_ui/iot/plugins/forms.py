@@ -26,6 +26,8 @@ from horizon import messages
 from openstack_dashboard.api import iotronic
 from openstack_dashboard import policy
 
+from iotronic_ui.iot import bulk
+
 LOG = logging.getLogger(__name__)
 
 
@@ -112,32 +114,19 @@ class InjectPluginForm(forms.SelfHandlingForm):
 
     def handle(self, request, data):
 
-        counter = 0
-
+        actions = []
         for board in data["board_list"]:
             for key, value in self.fields["board_list"].choices:
                 if key == board:
-
-                    try:
-                        inject = iotronic.plugin_inject(request, key,
-                                                        data["uuid"],
-                                                        data["onboot"])
-                        # LOG.debug("API: %s %s", plugin, request)
-                        message_text = inject
-                        messages.success(request, _(message_text))
-
-                        if counter != len(data["board_list"]) - 1:
-                            counter += 1
-                        else:
-                            return True
-
-                    except Exception:
-                        message_text = "Unable to inject plugin on board " \
-                                       + str(value) + "."
-                        exceptions.handle(request, _(message_text))
-
+                    failure = "Unable to inject plugin on board " \
+                              + str(value) + "."
+                    actions.append((iotronic.plugin_inject,
+                                    (key, data["uuid"], data["onboot"]),
+                                    None, failure))
                     break
 
+        return bulk.run_actions(request, actions)
+
 
 class StartPluginForm(forms.SelfHandlingForm):
 
@@ -177,38 +166,25 @@ class StartPluginForm(forms.SelfHandlingForm):
 
     def handle(self, request, data):
 
-        counter = 0
-
         if not data["parameters"]:
             data["parameters"] = {}
         else:
             data["parameters"] = json.loads(data["parameters"])
 
+        actions = []
         for board in data["board_list"]:
             for key, value in self.fields["board_list"].choices:
                 if key == board:
-
-                    try:
-                        action = iotronic.plugin_action(request, key,
-                                                        data["uuid"],
-                                                        "PluginStart",
-                                                        data["parameters"])
-                        # LOG.debug("API: %s %s", plugin, request)
-                        message_text = action
-                        messages.success(request, _(message_text))
-
-                        if counter != len(data["board_list"]) - 1:
-                            counter += 1
-                        else:
-                            return True
-
-                    except Exception:
-                        message_text = "Unable to start plugin on board " \
-                                       + str(value) + "."
-                        exceptions.handle(request, _(message_text))
-
+                    failure = "Unable to start plugin on board " \
+                              + str(value) + "."
+                    actions.append((iotronic.plugin_action,
+                                    (key, data["uuid"], "PluginStart",
+                                     data["parameters"]),
+                                    None, failure))
                     break
 
+        return bulk.run_actions(request, actions)
+
 
 class StopPluginForm(forms.SelfHandlingForm):
 
@@ -244,38 +220,25 @@ class StopPluginForm(forms.SelfHandlingForm):
 
     def handle(self, request, data):
 
-        counter = 0
-
         if not data["delay"]:
             data["delay"] = {}
         else:
             data["delay"] = {"delay": data["delay"]}
 
+        actions = []
         for board in data["board_list"]:
             for key, value in self.fields["board_list"].choices:
                 if key == board:
-
-                    try:
-                        action = iotronic.plugin_action(request, key,
-                                                        data["uuid"],
-                                                        "PluginStop",
-                                                        data["delay"])
-                        # LOG.debug("API: %s %s", plugin, request)
-                        message_text = action
-                        messages.success(request, _(message_text))
-
-                        if counter != len(data["board_list"]) - 1:
-                            counter += 1
-                        else:
-                            return True
-
-                    except Exception:
-                        message_text = "Unable to stop plugin on board " \
-                                       + str(value) + "."
-                        exceptions.handle(request, _(message_text))
-
+                    failure = "Unable to stop plugin on board " \
+                              + str(value) + "."
+                    actions.append((iotronic.plugin_action,
+                                    (key, data["uuid"], "PluginStop",
+                                     data["delay"]),
+                                    None, failure))
                     break
 
+        return bulk.run_actions(request, actions)
+
 
 class CallPluginForm(forms.SelfHandlingForm):
 
@@ -314,38 +277,25 @@ class CallPluginForm(forms.SelfHandlingForm):
 
     def handle(self, request, data):
 
-        counter = 0
-
         if not data["parameters"]:
             data["parameters"] = {}
         else:
             data["parameters"] = json.loads(data["parameters"])
 
+        actions = []
         for board in data["board_list"]:
             for key, value in self.fields["board_list"].choices:
                 if key == board:
-
-                    try:
-                        action = iotronic.plugin_action(request, key,
-                                                        data["uuid"],
-                                                        "PluginCall",
-                                                        data["parameters"])
-
-                        message_text = action
-                        messages.success(request, _(message_text))
-
-                        if counter != len(data["board_list"]) - 1:
-                            counter += 1
-                        else:
-                            return True
-
-                    except Exception:
-                        message_text = "Unable to call plugin on board " \
-                                       + str(value) + "."
-                        exceptions.handle(request, _(message_text))
-
+                    failure = "Unable to call plugin on board " \
+                              + str(value) + "."
+                    actions.append((iotronic.plugin_action,
+                                    (key, data["uuid"], "PluginCall",
+                                     data["parameters"]),
+                                    None, failure))
                     break
 
+        return bulk.run_actions(request, actions)
+
 
 class RemovePluginForm(forms.SelfHandlingForm):
 
@@ -375,33 +325,21 @@ class RemovePluginForm(forms.SelfHandlingForm):
 
     def handle(self, request, data):
 
-        counter = 0
-
+        actions = []
         for board in data["board_list"]:
             for key, value in self.fields["board_list"].choices:
                 if key == board:
-
-                    try:
-                        iotronic.plugin_remove(request,
-                                               key,
-                                               data["uuid"])
-                        # LOG.debug("API: %s %s", plugin, request)
-                        message_text = "Plugin removed successfully from" \
-                                       + " board " + str(value) + "."
-                        messages.success(request, _(message_text))
-
-                        if counter != len(data["board_list"]) - 1:
-                            counter += 1
-                        else:
-                            return True
-
-                    except Exception:
-                        message_text = "Unable to remove plugin from board " \
-                                       + str(value) + "."
-                        exceptions.handle(request, _(message_text))
-
+                    success = "Plugin removed successfully from" \
+                              + " board " + str(value) + "."
+                    failure = "Unable to remove plugin from board " \
+                              + str(value) + "."
+                    actions.append((iotronic.plugin_remove,
+                                    (key, data["uuid"]),
+                                    success, failure))
                     break
 
+        return bulk.run_actions(request, actions)
+
 
 class UpdatePluginForm(forms.SelfHandlingForm):
 
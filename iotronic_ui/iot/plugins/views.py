@@ -13,20 +13,21 @@
 import cPickle
 import logging
 
+from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon import forms
-# from horizon import messages
 from horizon import tables
 from horizon import tabs
 from horizon.utils import memoized
 
-from openstack_dashboard.api import iotronic, keystone
+from openstack_dashboard.api import iotronic
 from openstack_dashboard import policy
 
+from iotronic_ui.iot import degraded
 from iotronic_ui.iot.plugins import forms as project_forms
 from iotronic_ui.iot.plugins import tables as project_tables
 from iotronic_ui.iot.plugins import tabs as project_tabs
@@ -40,15 +41,19 @@ class IndexView(tables.DataTableView):
     page_title = _("Plugins")
 
     def get_data(self):
+        iotronic.set_deadline(self.request, getattr(
+            settings, 'IOTRONIC_UI_PAGE_DEADLINE', 20))
+
         plugins = []
-        users = []
+        owner_names = False
 
         # Admin
         if policy.check((("iot", "iot:list_all_plugins"),), self.request):
+            owner_names = True
             try:
                 plugins = iotronic.plugin_list(self.request, None, None,
-                                               all_plugins=True)
-                users = keystone.user_list(self.request)
+                                               all_plugins=True,
+                                               fields=iotronic.SUMMARY)
 
             except Exception:
                 exceptions.handle(self.request, _('Unable to retrieve plugins \
@@ -59,7 +64,8 @@ class IndexView(tables.DataTableView):
                           self.request):
             try:
                 plugins = iotronic.plugin_list(self.request, None, None,
-                                               with_public=True)
+                                               with_public=True,
+                                               fields=iotronic.SUMMARY)
 
             except Exception:
                 exceptions.handle(self.request,
@@ -69,7 +75,8 @@ class IndexView(tables.DataTableView):
         else:
             try:
                 plugins = iotronic.plugin_list(self.request, None, None,
-                                               with_public=True)
+                                               with_public=True,
+                                               fields=iotronic.SUMMARY)
 
             except Exception:
                 exceptions.handle(self.request,
@@ -77,11 +84,13 @@ class IndexView(tables.DataTableView):
 
         # Replace owner column values (user.id) with user.name (only Admin
         # can see human-readable names)
-        for plugin in plugins:
-            for user in users:
-                if plugin.owner == user.id:
-                    plugin.owner = user.name
-                    break
+        if owner_names:
+            owners = iotronic.owner_names(self.request,
+                                          [plugin.owner for plugin in plugins])
+            for plugin in plugins:
+                plugin.owner = owners.get(plugin.owner, plugin.owner)
+
+        degraded.warn(self.request)
 
         return plugins
 
@@ -112,7 +121,7 @@ class InjectView(forms.ModalFormView):
     def get_object(self):
         try:
             return iotronic.plugin_get(self.request, self.kwargs['plugin_id'],
-                                       None)
+                                       iotronic.NAME)
         except Exception:
             redirect = reverse("horizon:iot:plugins:index")
             exceptions.handle(self.request,
@@ -129,12 +138,9 @@ class InjectView(forms.ModalFormView):
         plugin = self.get_object()
 
         # Populate boards
-        boards = iotronic.board_list(self.request, "online", None, None)
-        boards.sort(key=lambda b: b.name)
-
         board_list = []
-        for board in boards:
-            board_list.append((board.uuid, _(board.name)))
+        for uuid, name in iotronic.board_choices(self.request, "online"):
+            board_list.append((uuid, _(name)))
 
         return {'uuid': plugin.uuid,
                 'name': plugin.name,
@@ -156,7 +162,7 @@ class StartView(forms.ModalFormView):
     def get_object(self):
         try:
             return iotronic.plugin_get(self.request, self.kwargs['plugin_id'],
-                                       None)
+                                       iotronic.NAME)
         except Exception:
             redirect = reverse("horizon:iot:plugins:index")
             exceptions.handle(self.request,
@@ -173,12 +179,9 @@ class StartView(forms.ModalFormView):
         plugin = self.get_object()
 
         # Populate boards
-        boards = iotronic.board_list(self.request, "online", None, None)
-        boards.sort(key=lambda b: b.name)
-
         board_list = []
-        for board in boards:
-            board_list.append((board.uuid, _(board.name)))
+        for uuid, name in iotronic.board_choices(self.request, "online"):
+            board_list.append((uuid, _(name)))
 
         return {'uuid': plugin.uuid,
                 'name': plugin.name,
@@ -200,7 +203,7 @@ class StopView(forms.ModalFormView):
     def get_object(self):
         try:
             return iotronic.plugin_get(self.request, self.kwargs['plugin_id'],
-                                       None)
+                                       iotronic.NAME)
         except Exception:
             redirect = reverse("horizon:iot:plugins:index")
             exceptions.handle(self.request,
@@ -217,12 +220,9 @@ class StopView(forms.ModalFormView):
         plugin = self.get_object()
 
         # Populate boards
-        boards = iotronic.board_list(self.request, "online", None, None)
-        boards.sort(key=lambda b: b.name)
-
         board_list = []
-        for board in boards:
-            board_list.append((board.uuid, _(board.name)))
+        for uuid, name in iotronic.board_choices(self.request, "online"):
+            board_list.append((uuid, _(name)))
 
         return {'uuid': plugin.uuid,
                 'name': plugin.name,
@@ -244,7 +244,7 @@ class CallView(forms.ModalFormView):
     def get_object(self):
         try:
             return iotronic.plugin_get(self.request, self.kwargs['plugin_id'],
-                                       None)
+                                       iotronic.NAME)
         except Exception:
             redirect = reverse("horizon:iot:plugins:index")
             exceptions.handle(self.request,
@@ -261,12 +261,9 @@ class CallView(forms.ModalFormView):
         plugin = self.get_object()
 
         # Populate boards
-        boards = iotronic.board_list(self.request, "online", None, None)
-        boards.sort(key=lambda b: b.name)
-
         board_list = []
-        for board in boards:
-            board_list.append((board.uuid, _(board.name)))
+        for uuid, name in iotronic.board_choices(self.request, "online"):
+            board_list.append((uuid, _(name)))
 
         return {'uuid': plugin.uuid,
                 'name': plugin.name,
@@ -288,7 +285,7 @@ class RemoveView(forms.ModalFormView):
     def get_object(self):
         try:
             return iotronic.plugin_get(self.request, self.kwargs['plugin_id'],
-                                       None)
+                                       iotronic.NAME)
         except Exception:
             redirect = reverse("horizon:iot:plugins:index")
             exceptions.handle(self.request,
@@ -305,12 +302,9 @@ class RemoveView(forms.ModalFormView):
         plugin = self.get_object()
 
         # Populate boards
-        boards = iotronic.board_list(self.request, "online", None, None)
-        boards.sort(key=lambda b: b.name)
-
         board_list = []
-        for board in boards:
-            board_list.append((board.uuid, _(board.name)))
+        for uuid, name in iotronic.board_choices(self.request, "online"):
+            board_list.append((uuid, _(name)))
 
         return {'uuid': plugin.uuid,
                 'name': plugin.name,
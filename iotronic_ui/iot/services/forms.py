@@ -21,6 +21,8 @@ from horizon import messages
 from openstack_dashboard.api import iotronic
 from openstack_dashboard import policy
 
+from iotronic_ui.iot import bulk
+
 LOG = logging.getLogger(__name__)
 
 
@@ -136,27 +138,15 @@ class ServiceActionForm(forms.SelfHandlingForm):
 
     def handle(self, request, data):
 
-        counter = 0
-
+        actions = []
         for board in data["board_list"]:
             for key, value in self.fields["board_list"].choices:
                 if key == board:
-
-                    try:
-                        action = iotronic.service_action(request, key,
-                                                         data["uuid"],
-                                                         data["action"])
-                        message_text = action
-                        messages.success(request, _(message_text))
-
-                        if counter != len(data["board_list"]) - 1:
-                            counter += 1
-                        else:
-                            return True
-
-                    except Exception:
-                        message_text = "Unable to execute action on board " \
-                                       + str(value) + "."
-                        exceptions.handle(request, _(message_text))
-
+                    failure = "Unable to execute action on board " \
+                              + str(value) + "."
+                    actions.append((iotronic.service_action,
+                                    (key, data["uuid"], data["action"]),
+                                    None, failure))
                     break
+
+        return bulk.run_actions(request, actions)
@@ -12,13 +12,13 @@
 
 import logging
 
+from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon import forms
-# from horizon import messages
 from horizon import tables
 from horizon import tabs
 from horizon.utils import memoized
@@ -26,6 +26,7 @@ from horizon.utils import memoized
 from openstack_dashboard.api import iotronic
 from openstack_dashboard import policy
 
+from iotronic_ui.iot import degraded
 from iotronic_ui.iot.services import forms as project_forms
 from iotronic_ui.iot.services import tables as project_tables
 from iotronic_ui.iot.services import tabs as project_tabs
@@ -40,12 +41,16 @@ class IndexView(tables.DataTableView):
     page_title = _("Services")
 
     def get_data(self):
+        iotronic.set_deadline(self.request, getattr(
+            settings, 'IOTRONIC_UI_PAGE_DEADLINE', 20))
+
         services = []
 
         # Admin
         if policy.check((("iot", "iot:list_all_services"),), self.request):
             try:
-                services = iotronic.service_list(self.request, None)
+                services = list(
+                    iotronic.service_catalog(self.request).values())
 
             except Exception:
                 exceptions.handle(self.request,
@@ -55,7 +60,8 @@ class IndexView(tables.DataTableView):
         elif policy.check((("iot", "iot:list_project_services"),),
                           self.request):
             try:
-                services = iotronic.service_list(self.request, None)
+                services = list(
+                    iotronic.service_catalog(self.request).values())
 
             except Exception:
                 exceptions.handle(self.request,
@@ -64,12 +70,15 @@ class IndexView(tables.DataTableView):
         # Other users
         else:
             try:
-                services = iotronic.service_list(self.request, None)
+                services = list(
+                    iotronic.service_catalog(self.request).values())
 
             except Exception:
                 exceptions.handle(self.request,
                                   _('Unable to retrieve user services list.'))
 
+        degraded.warn(self.request)
+
         return services
 
 
@@ -99,7 +108,7 @@ class UpdateView(forms.ModalFormView):
         try:
             return iotronic.service_get(self.request,
                                         self.kwargs['service_id'],
-                                        None)
+                                        iotronic.SUMMARY)
         except Exception:
             redirect = reverse("horizon:iot:services:index")
             exceptions.handle(self.request,
@@ -137,7 +146,7 @@ class ActionView(forms.ModalFormView):
         try:
             return iotronic.service_get(self.request,
                                         self.kwargs['service_id'],
-                                        None)
+                                        iotronic.NAME)
         except Exception:
             redirect = reverse("horizon:iot:services:index")
             exceptions.handle(self.request,
@@ -154,12 +163,9 @@ class ActionView(forms.ModalFormView):
         service = self.get_object()
 
         # Populate boards
-        boards = iotronic.board_list(self.request, "online", None, None)
-        boards.sort(key=lambda b: b.name)
-
         board_list = []
-        for board in boards:
-            board_list.append((board.uuid, _(board.name)))
+        for uuid, name in iotronic.board_choices(self.request, "online"):
+            board_list.append((uuid, _(name)))
 
         return {'uuid': service.uuid,
                 'name': service.name,
@@ -0,0 +1,54 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Log the IoTronic cache counters and circuit breaker states.
+
+Every Horizon process logs its own, every IOTRONIC_UI_STATS_INTERVAL
+seconds, to tune the IOTRONIC_UI_CACHE_TTL and IOTRONIC_UI_CACHE_MAX_ENTRIES
+of the entities.
+"""
+
+import logging
+import threading
+import time
+
+from openstack_dashboard import api
+
+
+LOG = logging.getLogger(__name__)
+
+
+def log_stats():
+    """Log the counters of every cache and the state of every breaker."""
+    for entity, stats in sorted(api.iotronic.cache_stats().items()):
+        LOG.info('IoTronic cache %s: %s', entity,
+                 ', '.join('%s=%s' % item for item in sorted(stats.items())))
+
+    for endpoint, state in sorted(api.iotronic.breaker_states().items()):
+        LOG.info('IoTronic circuit breaker of %s: %s', endpoint, state)
+
+
+def start_logger(interval):
+    """Log the statistics every interval seconds in a background thread."""
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                log_stats()
+            except Exception:
+                LOG.exception('Unable to log the IoTronic statistics')
+
+    thread = threading.Thread(target=run, name='iotronic-ui-stats')
+    thread.daemon = True
+    thread.start()
+
+    return thread
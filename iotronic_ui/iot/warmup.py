@@ -0,0 +1,155 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Prefetch the IoTronic data shown first by the IoT dashboard.
+
+The service catalog, fleet directory, plugin index and board inventory of
+the IOTRONIC_UI_WARMUP_PROJECTS are loaded with the service credential
+IOTRONIC_UI_WARMUP_CREDENTIALS, at most IOTRONIC_UI_WARMUP_CONCURRENCY
+projects at a time. Their cached data is shared with the users of those
+projects only when IOTRONIC_UI_CACHE_SCOPE is 'roles' and the service user
+has their same roles.
+"""
+
+from concurrent import futures
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from keystoneauth1.identity import v3
+from keystoneauth1 import session as ks_session
+
+from openstack_dashboard import api
+
+
+LOG = logging.getLogger(__name__)
+
+
+class _Token(object):
+    def __init__(self, token_id):
+        self.id = token_id
+
+
+class _ServiceUser(object):
+    """The attributes of a Horizon user read by the IoTronic API calls."""
+
+    def __init__(self, auth_ref, region):
+        self.id = auth_ref.user_id
+        self.token = _Token(auth_ref.auth_token)
+        self.project_id = auth_ref.project_id
+        self.tenant_id = auth_ref.project_id
+        self.roles = [{'name': name} for name in auth_ref.role_names]
+        self.service_catalog = auth_ref.service_catalog.catalog
+        self.services_region = region
+
+
+class ServiceRequest(object):
+    """Stand-in for a Horizon request made by the warm-up service user."""
+
+    def __init__(self, auth_ref, region=None):
+        if region is None:
+            region = _iot_region(auth_ref.service_catalog.catalog)
+        self.user = _ServiceUser(auth_ref, region)
+
+
+def _iot_region(catalog):
+    for service in catalog:
+        if service.get('type') == 'iot':
+            for endpoint in service.get('endpoints', []):
+                return endpoint.get('region_id') or endpoint.get('region')
+
+    return None
+
+
+def service_request(project_id):
+    """Authenticate the warm-up service user on a project."""
+    credentials = dict(getattr(settings, 'IOTRONIC_UI_WARMUP_CREDENTIALS',
+                               {}))
+    credentials.setdefault('auth_url', settings.OPENSTACK_KEYSTONE_URL)
+    credentials.setdefault('user_domain_name', 'Default')
+    credentials['project_id'] = project_id
+
+    verify = not getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
+    verify = getattr(settings, 'OPENSTACK_SSL_CACERT', None) or verify
+
+    session = ks_session.Session(auth=v3.Password(**credentials),
+                                 verify=verify)
+    auth_ref = session.auth.get_access(session)
+    return ServiceRequest(auth_ref,
+                          getattr(settings, 'IOTRONIC_UI_WARMUP_REGION', None))
+
+
+def warm_up_project(project_id):
+    """Prefetch the data of a project, stopping at the first failure."""
+    # The board inventory is built as by the boards panel
+    from iotronic_ui.iot.boards import views as board_views
+
+    request = service_request(project_id)
+    api.iotronic.service_catalog(request)
+    api.iotronic.fleet_directory(request)
+    api.iotronic.plugin_index(request)
+    api.iotronic.board_inventory(request, board_views._load_boards,
+                                 board_views._enrich_boards)
+
+
+def warm_up(projects=None):
+    """Prefetch the data of the given, or of the configured, projects.
+
+    Returns a dict mapping the projects to the exception that stopped their
+    warm-up, or to None.
+    """
+    if projects is None:
+        projects = getattr(settings, 'IOTRONIC_UI_WARMUP_PROJECTS', [])
+
+    concurrency = getattr(settings, 'IOTRONIC_UI_WARMUP_CONCURRENCY', 2)
+    results = {}
+
+    pool = futures.ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        pending = dict((pool.submit(warm_up_project, project), project)
+                       for project in projects)
+
+        for future in futures.as_completed(pending):
+            project = pending[future]
+            try:
+                future.result()
+                results[project] = None
+            except Exception as e:
+                LOG.warning('Unable to warm up the IoT dashboard data of '
+                            'project %s: %r', project, e)
+                results[project] = e
+    finally:
+        pool.shutdown(wait=True)
+
+    return results
+
+
+def warm_up_in_background():
+    """Warm up the configured projects in a background thread.
+
+    The start is delayed by a random time of up to
+    IOTRONIC_UI_WARMUP_SPREAD seconds, so that the processes of a rolling
+    restart do not hit IoTronic at the same moment.
+    """
+    spread = getattr(settings, 'IOTRONIC_UI_WARMUP_SPREAD', 30)
+
+    def run():
+        time.sleep(random.uniform(0, spread))
+        warm_up()
+
+    thread = threading.Thread(target=run, name='iotronic-ui-warmup')
+    thread.daemon = True
+    thread.start()
+
+    return thread
@@ -21,6 +21,8 @@ from horizon import messages
 from openstack_dashboard.api import iotronic
 from openstack_dashboard import policy
 
+from iotronic_ui.iot import bulk
+
 LOG = logging.getLogger(__name__)
 
 
@@ -89,19 +91,9 @@ class UnexposeWebserviceForm(forms.SelfHandlingForm):
 
     def handle(self, request, data):
 
-        counter = 0
-        for ws in data["ws_onboard"]:
-            try:
-                iotronic.webservice_unexpose(request, ws)
-
-                message_text = "Web Service(s) unexposed successfully."
-                messages.success(request, _(message_text))
-
-                if counter != len(data["ws_onboard"]) - 1:
-                    counter += 1
-                else:
-                    return True
+        actions = [(iotronic.webservice_unexpose, (ws,),
+                    "Web Service(s) unexposed successfully.",
+                    "Unable to unexpose web service.")
+                   for ws in data["ws_onboard"]]
 
-            except Exception:
-                message_text = "Unable to unexpose web service."
-                exceptions.handle(request, _(message_text))
+        return bulk.run_actions(request, actions)
@@ -12,20 +12,20 @@
 
 import logging
 
+from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon import forms
-# from horizon import messages
 from horizon import tables
 from horizon import tabs
 from horizon.utils import memoized
 
 from openstack_dashboard.api import iotronic
-from openstack_dashboard import policy
 
+from iotronic_ui.iot import degraded
 from iotronic_ui.iot.webservices import forms as project_forms
 from iotronic_ui.iot.webservices import tables as project_tables
 from iotronic_ui.iot.webservices import tabs as project_tabs
@@ -40,63 +40,67 @@ class IndexView(tables.DataTableView):
     page_title = _("Web Services")
 
     def get_data(self):
+        iotronic.set_deadline(self.request, getattr(
+            settings, 'IOTRONIC_UI_PAGE_DEADLINE', 20))
+
         webservices = []
         en_webservices = []
-
-        # Admin
-        if policy.check((("iot", "iot:list_all_webservices"),), self.request):
+        board_names = {}
+
+        # The web services, the enabled boards and the board names do not
+        # depend on each other: fetch them at once. The policies of the
+        # admins, of the project admins and of the other users all list
+        # them the same way.
+        results, errors = iotronic.call_concurrently(self.request, [
+            (iotronic.webservice_list, (None, iotronic.SUMMARY)),
+            (iotronic.webservice_enabled_list, ()),
+            (iotronic.board_list, (None, None, None, iotronic.NAME)),
+        ])
+
+        if 0 in errors or 1 in errors:
             try:
-                webservices = iotronic.webservice_list(self.request,
-                                                       None)
-                en_webservices = iotronic.webservice_enabled_list(self.request)
-
-            except Exception:
-                exceptions.handle(self.request,
-                                  _('Unable to retrieve webservices list.'))
-
-        # Admin_iot_project
-        elif policy.check((("iot", "iot:list_project_webservices"),),
-                          self.request):
-            try:
-                webservices = iotronic.webservice_list(self.request,
-                                                       None)
-                en_webservices = iotronic.webservice_enabled_list(self.request)
-
+                raise errors.get(0, errors.get(1))
             except Exception:
                 exceptions.handle(self.request,
                                   _('Unable to retrieve webservices list.'))
-
-        # Other users
         else:
-            try:
-                webservices = iotronic.webservice_list(self.request,
-                                                       None)
-                en_webservices = iotronic.webservice_enabled_list(self.request)
-
-            except Exception:
-                exceptions.handle(self.request,
-                                  _('Unable to retrieve webservices list.'))
+            webservices, en_webservices = results[0], results[1]
+
+        if en_webservices:
+            if 2 in errors:
+                try:
+                    raise errors[2]
+                except Exception:
+                    exceptions.handle(self.request,
+                                      _('Unable to retrieve boards list.'))
+            else:
+                board_names = dict((board.uuid, board.name)
+                                   for board in results[2])
+
+        # Group the web services by board in a single pass
+        board_webservices = {}
+        for ws in webservices:
+            board_webservices.setdefault(ws.board_uuid, []).append(ws)
 
         # Append some information to the webservice
         # LOG.debug('WSS: %s', webservices)
         for ws_en in en_webservices:
 
             ws_list = []
+            domain = "." + ws_en.dns + "." + ws_en.zone
 
-            for ws in webservices:
-                if ws_en.board_uuid == ws.board_uuid:
+            for ws in board_webservices.get(ws_en.board_uuid, []):
+                service_url = "https://" + ws.name + domain
+                ws_list.append({"local_port": ws.port,
+                                "service_url": service_url})
 
-                    service_url = "https://" + ws.name + "." + ws_en.dns +\
-                                  "." + ws_en.zone
-                    ws_list.append({"local_port": ws.port,
-                                    "service_url": service_url})
+                ws_en.uuid = ws.uuid
 
-                    ws_en.uuid = ws.uuid
-
-            board = iotronic.board_get(self.request, ws_en.board_uuid, None)
-            ws_en.name = board.name
+            ws_en.name = board_names.get(ws_en.board_uuid)
             ws_en._info.update(dict(webservices=ws_list))
 
+        degraded.warn(self.request)
+
         return en_webservices
 
 
@@ -115,7 +119,7 @@ class ExposeView(forms.ModalFormView):
         try:
             return iotronic.board_get(self.request,
                                       self.kwargs['board_id'],
-                                      None)
+                                      iotronic.NAME)
         except Exception:
             redirect = reverse("horizon:iot:webservices:index")
             exceptions.handle(self.request,
@@ -152,7 +156,7 @@ class UnexposeView(forms.ModalFormView):
         try:
             return iotronic.board_get(self.request,
                                       self.kwargs['board_id'],
-                                      None)
+                                      iotronic.NAME)
         except Exception:
             redirect = reverse("horizon:iot:webservices:index")
             exceptions.handle(self.request,
@@ -211,7 +215,7 @@ class DetailView(tabs.TabView):
                                                  None)
             board = iotronic.board_get(self.request,
                                        webservice.board_uuid,
-                                       None)
+                                       iotronic.NAME)
 
             webservice._info.update({u'board_name': board.name})
             webservice.board_name = board.name